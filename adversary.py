@@ -0,0 +1,184 @@
+# Made by Isaac Joffe
+
+from operator import itemgetter    # to pick out the results of some words
+
+# to give results of guesses
+from feedback import FeedbackMatrix, pattern_table
+
+
+LIMIT = 28    # most guesses to follow any game for
+
+
+class Adversary():
+    """
+    A class to play against the solver as Absurdle does, never settling on a
+    secret word but giving each guess whichever result keeps the game going
+    longest, so the most attempts the solver can ever take is known for
+    certain rather than only on average.
+
+    Every result of every guess is followed, so this is the same as playing
+    every answer at once, with the answers split by the result of each guess
+    in a single pass over a row of precomputed results.
+
+    Attributes:
+        words: WordSet
+            the data on all possible words
+        answers: list of strings
+            every word the adversary may be thinking of
+        matrix: FeedbackMatrix
+            the result of every word guessed against every answer
+
+    Methods:
+        evaluate(game, limit):
+            gives the most attempts a game can take against any answer
+        play(game, answers, limit):
+            gives the worst case of a game against some of the answers
+        split(guess, answers):
+            gives the answers left after each result of a guess
+    """
+
+    def __init__(self, words, answers=None, matrix=None):
+        """
+        Sets up the adversary.
+
+        Arguments:
+            words: WordSet
+                the data on all possible words
+            answers: list of strings
+                every word the adversary may be thinking of, every possible
+                word if not given
+            matrix: FeedbackMatrix
+                the result of every word guessed against every answer,
+                computed if not given
+
+        Returns:
+            None, but sets up the adversary
+        """
+
+        self.words = words
+        self.answers = list(words.words) if answers is None else answers
+        if matrix is None:
+            matrix = FeedbackMatrix(words.words, self.answers)
+        self.matrix = matrix
+        return
+
+    def evaluate(self, game, limit=LIMIT):
+        """
+        Gives the most attempts a game can take against any answer, along
+        with the results the adversary gives to make it take that long.
+
+        Arguments:
+            game: Game
+                a new game, or anything else able to choose, copy and update
+                with results in the same way
+            limit: integer
+                the most guesses to follow any game for
+
+        Returns:
+            attempts: integer
+                the most attempts any answer takes, or None if the solver
+                gives up on some answer
+            count: integer
+                the number of answers taking that many attempts, or given up
+                on
+            line: list of tuples of strings
+                every guess the adversary forces along with its result,
+                always taking the largest group of answers when several are
+                equally hard
+        """
+
+        return self.play(game, tuple(range(len(self.answers))), limit)
+
+    def play(self, game, answers, limit):
+        """
+        Gives the worst case of a game against some of the answers, following
+        every result of every guess. Each result leaves its own answers, so
+        no game is ever played out twice and nothing is remembered.
+
+        Arguments:
+            game: Game
+                what is known about the game so far
+            answers: tuple of integers
+                the indices of the answers giving every result so far
+            limit: integer
+                the most guesses still to follow the game for
+
+        Returns:
+            attempts: integer
+                the most attempts any of the answers takes from here, or None
+                if the solver gives up on some of them
+            count: integer
+                the number of answers taking that many attempts, or given up
+                on
+            line: list of tuples of strings
+                every guess the adversary forces from here along with its
+                result
+        """
+
+        if not limit or not game.count():
+            return None, len(answers), []    # the solver has given up
+
+        guess = game.next_guess()
+        solved = "g" * len(guess)
+        patterns = pattern_table(len(guess))
+        worst = None
+        # the largest groups come first so they win ties, as in Absurdle
+        for code, group in sorted(self.split(guess, answers).items(),
+            key=lambda item: (-len(item[1]), item[0])):
+            result = patterns[code]
+            if result == solved:
+                attempts, count, line = 1, 1, [(guess, result)]
+            else:
+                branch = game.copy()
+                branch.update(guess, result)
+                attempts, count, line = self.play(branch, tuple(group),
+                    limit - 1)
+                line = [(guess, result)] + line
+                if attempts is not None:
+                    attempts += 1
+            if worst is None or rank(attempts) > rank(worst[0]):
+                worst = (attempts, count, line)
+            elif attempts == worst[0]:
+                worst = (attempts, worst[1] + count, worst[2])
+        return worst
+
+    def split(self, guess, answers):
+        """
+        Gives the answers left after each result of a guess, reading the
+        results of every answer from one row at once.
+
+        Arguments:
+            guess: string
+                the word to guess
+            answers: tuple of integers
+                the indices of the answers, in order
+
+        Returns:
+            groups: dictionary
+                holds the indices of the answers giving each encoded result,
+                in order
+        """
+
+        row = self.matrix.row(guess)
+        codes = itemgetter(*answers)(row) if len(answers) > 1 \
+            else [row[answers[0]]]
+        groups = {}
+        for index, code in zip(answers, codes):
+            groups.setdefault(code, []).append(index)
+        return groups
+
+
+def rank(attempts):
+    """
+    Orders worst cases from best to worst, with giving up the worst of all.
+
+    Arguments:
+        attempts: integer
+            the most attempts taken, or None if the solver gave up
+
+    Returns:
+        rank: float
+            larger for worse cases
+    """
+
+    return float("inf") if attempts is None else attempts
@@ -0,0 +1,184 @@
+# Made by Isaac Joffe
+
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"    # letters words are made of
+
+
+class Constraints():
+    """
+    A class to hold everything the results of a game have revealed about the
+    secret word, in the same form however the results were reached, so games
+    that know the same things can share their work.
+
+    Attributes:
+        alphabet: string
+            every letter words may be made of, in the order they are coded
+        allowed: tuple of integers
+            the set of letters that may still be in each position, one bit
+            per letter
+        minimum: tuple of integers
+            the fewest times each letter can occur in the word
+        maximum: tuple of integers
+            the most times each letter can occur in the word
+
+    Methods:
+        add(guess, result):
+            gives the constraints once the result of a guess is also known
+        extend(history):
+            gives the constraints once every result of a history is known
+        key():
+            gives a tuple that is equal only for equal constraints
+    """
+
+    __slots__ = ("alphabet", "allowed", "minimum", "maximum")
+
+    def __init__(self, length, allowed=None, minimum=None, maximum=None,
+        alphabet=ALPHABET):
+        """
+        Sets up the constraints, which by default rule nothing out.
+
+        Arguments:
+            length: integer
+                number of letters in each word
+            allowed: tuple of integers
+                the set of letters that may still be in each position
+            minimum: tuple of integers
+                the fewest times each letter can occur in the word
+            maximum: tuple of integers
+                the most times each letter can occur in the word
+            alphabet: string
+                every letter words may be made of, in the order they are coded
+
+        Returns:
+            None, but sets up the constraints
+        """
+
+        every = (1 << len(alphabet)) - 1
+        self.alphabet = alphabet
+        self.allowed = allowed if allowed is not None else (every,) * length
+        self.minimum = minimum if minimum is not None \
+            else (0,) * len(alphabet)
+        self.maximum = maximum if maximum is not None \
+            else (length,) * len(alphabet)
+        return
+
+    def add(self, guess, result):
+        """
+        Gives the constraints once the result of a guess is also known, in
+        the simplest form that rules out the same words.
+
+        Arguments:
+            guess: string
+                word that was guessed
+            result: string
+                string of colours given in response to the guess
+
+        Returns:
+            constraints: Constraints
+                a new set of constraints, leaving this one unchanged
+        """
+
+        if len(guess) != len(self.allowed):
+            raise ValueError("{} is not a guess of {} letters".format(guess,
+                len(self.allowed)))
+        if len(result) != len(guess) or set(result) - set("byg"):
+            raise ValueError("{} is not a result of {}".format(result, guess))
+        letters = len(self.alphabet)
+        allowed = list(self.allowed)
+        minimum = list(self.minimum)
+        maximum = list(self.maximum)
+        found = [0] * letters    # copies of each letter shown to be present
+        missing = 0    # letters with a copy shown to be absent
+        for number in range(len(result)):
+            letter = self.alphabet.find(guess[number])
+            if letter < 0:
+                raise ValueError("{} is not a letter of the alphabet".format(
+                    guess[number]))
+            if result[number] == "g":
+                allowed[number] = 1 << letter
+                found[letter] += 1
+            else:
+                # the letter would have been green if it were in this spot
+                allowed[number] &= ~(1 << letter)
+                if result[number] == "y":
+                    found[letter] += 1
+                else:
+                    missing |= 1 << letter
+        for letter in range(letters):
+            minimum[letter] = max(minimum[letter], found[letter])
+            if missing >> letter & 1:
+                # a letter shown absent occurs exactly as often as shown
+                maximum[letter] = min(maximum[letter], found[letter])
+
+        # bring equivalent constraints to the same form
+        for letter in range(letters):
+            if not maximum[letter]:
+                for number in range(len(allowed)):
+                    allowed[number] &= ~(1 << letter)
+            spots = sum(mask >> letter & 1 for mask in allowed)
+            maximum[letter] = min(maximum[letter], spots)
+        return Constraints(len(allowed), tuple(allowed), tuple(minimum),
+            tuple(maximum), self.alphabet)
+
+    def extend(self, history):
+        """
+        Gives the constraints once every result of a history is also known.
+
+        Arguments:
+            history: list of tuples of strings
+                guesses along with their results
+
+        Returns:
+            constraints: Constraints
+                a new set of constraints, leaving this one unchanged
+        """
+
+        constraints = self
+        for guess, result in history:
+            constraints = constraints.add(guess, result)
+        return constraints
+
+    def key(self):
+        """
+        Gives a tuple that is equal only for equal constraints.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            key: tuple
+                the allowed letters and the letter counts
+        """
+
+        return (self.allowed, self.minimum, self.maximum)
+
+    def __eq__(self, other):
+        """
+        Compares the constraints with others.
+
+        Arguments:
+            other: Constraints
+                the constraints to compare with
+
+        Returns:
+            equal: boolean
+                whether both rule out exactly the same things
+        """
+
+        if not isinstance(other, Constraints):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self):
+        """
+        Gives a hash of the constraints, so they can key dictionaries.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            hash: integer
+                equal for equal constraints
+        """
+
+        return hash(self.key())
@@ -0,0 +1,219 @@
+# Made by Isaac Joffe
+
+import os    # to replace files atomically
+import json    # to store the tree in a compact, readable format
+
+from feedback import wordle    # to give results of guesses
+
+
+TREE_VERSION = 1    # bump whenever the layout of the stored tree changes
+
+
+class DecisionTree():
+    """
+    A class to hold every guess a solver makes against every answer, so games
+    can be played by looking guesses up instead of working them out.
+
+    Each node of the tree is a list of the word to guess and a dictionary
+    holding the node to move to after each result. An answer reaching a node
+    that guesses it has the result of all greens, which leads to no node,
+    while a result after which the solver gives up leads to the number of
+    answers left unsolved.
+
+    Attributes:
+        root: list
+            the node holding the first guess of every game
+        strategy: string
+            how the guesses in the tree were chosen
+
+    Methods:
+        compile(game, answers, oracle):
+            plays a game against every answer at once to build the tree
+        grow(game, answers, oracle, limit):
+            builds the part of the tree reached by a group of answers
+        load(filename):
+            reads the tree from a file
+        save(filename):
+            writes the tree to a file
+        play(results):
+            gives the guess to make after a sequence of results
+        attempts():
+            counts the answers solved in each number of attempts
+    """
+
+    def __init__(self, root=None, strategy=None):
+        """
+        Holds a tree that has already been built.
+
+        Arguments:
+            root: list
+                the node holding the first guess of every game
+            strategy: string
+                how the guesses in the tree were chosen
+
+        Returns:
+            None, but sets up the tree
+        """
+
+        self.root = root
+        self.strategy = strategy
+        return
+
+    def compile(self, game, answers, oracle=wordle, limit=28):
+        """
+        Plays a game against every answer at once, splitting the game each
+        time a guess gives different answers different results.
+
+        Arguments:
+            game: Game
+                a new game, or anything else able to choose, copy and update
+                with results in the same way
+            answers: list of strings
+                every word the tree should be able to solve
+            oracle: function
+                gives the string of colours for a word-guess pair
+            limit: integer
+                the most guesses to follow any game for
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        self.strategy = getattr(game, "strategy", None)
+        self.root = self.grow(game, answers, oracle, limit)
+        return
+
+    def grow(self, game, answers, oracle, limit):
+        """
+        Builds the part of the tree reached by a group of answers.
+
+        Arguments:
+            game: Game
+                what is known about the game so far
+            answers: list of strings
+                the answers giving every result so far
+            oracle: function
+                gives the string of colours for a word-guess pair
+            limit: integer
+                the most guesses still to follow the game for
+
+        Returns:
+            node: list or integer
+                the guess to make and the node following each result, or the
+                number of answers if they cannot be solved from here
+        """
+
+        if not limit or not game.count():
+            return len(answers)    # the solver has given up on these answers
+        guess = game.next_guess()
+        # group the answers by the result each gives to the guess
+        groups = {}
+        for answer in answers:
+            groups.setdefault(oracle(answer, guess), []).append(answer)
+        following = {}
+        for result in sorted(groups):
+            if result == "g" * len(guess):
+                following[result] = None    # the game is over
+                continue
+            branch = game.copy()
+            branch.update(guess, result)
+            following[result] = self.grow(branch, groups[result], oracle,
+                limit - 1)
+        return [guess, following]
+
+    def load(self, filename):
+        """
+        Reads the tree from a file written by save.
+
+        Arguments:
+            filename: string
+                name of the file the tree is stored in
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        try:
+            with open(filename) as infile:
+                data = json.load(infile)
+        except ValueError:
+            raise ValueError("{} is not a decision tree".format(filename))
+        if not isinstance(data, dict) or data.get("version") != TREE_VERSION:
+            raise ValueError("{} is not a decision tree of version {}".format(
+                filename, TREE_VERSION))
+        self.root = data["tree"]
+        self.strategy = data["strategy"]
+        return
+
+    def save(self, filename):
+        """
+        Writes the tree to a file, as compactly as its layout allows.
+
+        Arguments:
+            filename: string
+                name of the file to store the tree in
+
+        Returns:
+            None, but creates a file containing the tree
+        """
+
+        data = {"version": TREE_VERSION, "strategy": self.strategy,
+            "tree": self.root}
+        # write to a temporary file first so a crash never leaves half a tree
+        partial = filename + ".partial"
+        with open(partial, "w") as outfile:
+            json.dump(data, outfile, separators=(",", ":"))
+        os.replace(partial, filename)
+        return
+
+    def play(self, results):
+        """
+        Gives the guess to make after a sequence of results, by following the
+        tree without working anything out.
+
+        Arguments:
+            results: list of strings
+                the result of each guess made so far, in order
+
+        Returns:
+            guess: string
+                the word to guess next, or None if the results never occur
+                for any answer the tree was built for
+        """
+
+        node = self.root
+        for result in results:
+            if not isinstance(node, list):
+                break
+            node = node[1].get(result)
+        if not isinstance(node, list):
+            return None
+        return node[0]
+
+    def attempts(self):
+        """
+        Counts the answers solved in each number of attempts, exactly, by
+        walking the tree rather than playing any games.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            attempts: dictionary
+                holds the number of answers solved in each number of attempts,
+                with answers the solver gave up on counted under None
+        """
+
+        attempts = {}
+        nodes = [(self.root, 1)]
+        while nodes:
+            node, depth = nodes.pop()
+            if isinstance(node, int):
+                attempts[None] = attempts.get(None, 0) + node
+                continue
+            for following in node[1].values():
+                if following is None:
+                    attempts[depth] = attempts.get(depth, 0) + 1
+                else:
+                    nodes.append((following, depth + 1))
+        return attempts
@@ -0,0 +1,632 @@
+# Made by Isaac Joffe
+
+import sys    # to tell the byte order of the machine
+import os    # to create the cache directory and replace files atomically
+import argparse    # for command line arguments
+import hashlib    # to key cached matrices by the word lists they hold
+import mmap    # to map cached matrices straight into memory
+from array import array    # to read wide results on any machine
+from functools import lru_cache    # to decode results of each length once
+
+
+COLOURS = "byg"    # colour of each digit when a result is read in base three
+LENGTH = 5    # number of letters in a word of Wordle itself
+# type of integer holding a result, by the number of bytes it takes
+TYPECODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+MATRIX_VERSION = 2    # bump whenever the oracle changes how words are coloured
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+    ".wordle_cache")
+# results Wordle itself gives, as (word, guess, result), with repeated letters
+KNOWN_RESULTS = (("abbey", "kebab", "bygyy"), ("those", "geese", "bbbgg"),
+    ("crane", "eerie", "bbybg"), ("lever", "eerie", "ygybb"),
+    ("array", "radar", "yybgy"), ("sissy", "mists", "bggby"),
+    ("puppy", "poppa", "gbggb"), ("abbey", "bobby", "ybgbg"))
+
+
+def wordle(word, guess):
+    """
+    Gives the colour-based response to an word-guess pair, exactly how Wordle
+    itself would.
+
+    Arguments:
+        word: string
+            secret word trying to be cracked
+        guess: string
+            word being guessed by the wordle solver
+
+    Returns:
+        result: string
+            string of colours to be interpreted by the solver
+    """
+
+    # letters of the word not matched exactly, each usable for one yellow
+    unused = {}
+    for index in range(len(guess)):
+        if guess[index] != word[index]:
+            unused[word[index]] = unused.get(word[index], 0) + 1
+    result = ""
+    for index in range(len(guess)):
+        if guess[index] == word[index]:
+            result += "g"
+        elif unused.get(guess[index], 0):
+            unused[guess[index]] -= 1    # earlier letters take yellows first
+            result += "y"
+        else:
+            result += "b"
+    return result
+
+
+def reference(word, guess):
+    """
+    Gives the colour-based response to an word-guess pair by crossing off
+    letters one at a time, as a slow but obviously correct check on wordle.
+
+    Arguments:
+        word: string
+            secret word trying to be cracked
+        guess: string
+            word being guessed by the wordle solver
+
+    Returns:
+        result: string
+            string of colours to be interpreted by the solver
+    """
+
+    left = list(word)    # letters of the word not yet given a colour
+    result = ["b"] * len(guess)
+    for index in range(len(guess)):
+        if guess[index] == word[index]:
+            result[index] = "g"
+            left[index] = None
+    for index in range(len(guess)):
+        if result[index] == "b" and guess[index] in left:
+            result[index] = "y"
+            left[left.index(guess[index])] = None
+    return "".join(result)
+
+
+def encode_pattern(result):
+    """
+    Converts a string of colours into a single integer, between 0 and 242
+    for a five letter word.
+
+    Arguments:
+        result: string
+            string of colours as given by Wordle
+
+    Returns:
+        code: integer
+            the result read as a base three number, first letter lowest
+    """
+
+    code = 0
+    for letter in reversed(result):
+        code = code * 3 + COLOURS.index(letter)
+    return code
+
+
+def decode_pattern(code, length=LENGTH):
+    """
+    Converts an integer made by encode_pattern back into a string of colours.
+
+    Arguments:
+        code: integer
+            the result read as a base three number, first letter lowest
+        length: integer
+            the number of letters in the word that was guessed
+
+    Returns:
+        result: string
+            string of colours as given by Wordle
+    """
+
+    result = ""
+    for index in range(length):
+        result += COLOURS[code % 3]
+        code //= 3
+    return result
+
+
+@lru_cache(maxsize=None)
+def pattern_table(length):
+    """
+    Gives every possible result of a word of a given length, so decoding is a
+    single lookup.
+
+    Arguments:
+        length: integer
+            the number of letters in the word that was guessed
+
+    Returns:
+        patterns: list of strings
+            the string of colours of each encoded result
+    """
+
+    return [decode_pattern(code, length) for code in range(3 ** length)]
+
+
+def pattern_width(length):
+    """
+    Gives the number of bytes needed to hold any encoded result of a word,
+    one byte for up to five letters and two for up to ten.
+
+    Arguments:
+        length: integer
+            the number of letters in the word that was guessed
+
+    Returns:
+        width: integer
+            the number of bytes, one of the keys of TYPECODES
+    """
+
+    width = 1
+    while 3 ** length > 256 ** width:
+        width *= 2
+    return width
+
+
+class BatchOracle():
+    """
+    A class to give the results of guesses against many answers at once,
+    exactly as wordle would one pair at a time.
+
+    Each answer is a lane of one or more bytes of a long integer, so a single
+    operation on the integers works on every answer at once. Each lane is
+    wide enough for every result of a word of its length, so lanes never
+    carry into one another.
+
+    Attributes:
+        answers: list of strings
+            words that may be correct, one per lane of every row
+        width: integer
+            the number of bytes in each lane
+        letters: dictionary
+            holds the code of each letter in the answers, counted from one so
+            that no letter is coded the same as the padding of a lane
+        columns: list of bytes
+            the code of the letter each answer has in each position
+        ones: integer
+            has a lane of one for every answer
+        counts: dictionary
+            holds the number of times each answer contains a letter, as an
+            integer, for each letter needed so far
+        tables: list of bytes
+            translation tables marking counts of at least each number
+
+    Methods:
+        count(letter):
+            gives how many times each answer contains a letter
+        row(guess):
+            gives the encoded results of a guess against every answer
+        rows(guesses):
+            gives the encoded results of many guesses against every answer
+        results(guess):
+            gives the string of colours of a guess against every answer
+    """
+
+    def __init__(self, answers):
+        """
+        Lays out the letters of every answer so they can be compared at once.
+
+        Arguments:
+            answers: list of strings
+                words that may be correct
+
+        Returns:
+            None, but sets up the oracle
+        """
+
+        self.answers = answers
+        length = len(answers[0]) if answers else 0
+        self.width = pattern_width(length)
+        self.letters = {letter: code + 1 for code, letter \
+            in enumerate(sorted(set("".join(answers))))}
+        if len(self.letters) > 255:
+            raise ValueError("answers use more than 255 different letters")
+        self.columns = []
+        for index in range(length):
+            column = bytearray(len(answers) * self.width)
+            column[::self.width] = bytes(self.letters[answer[index]] \
+                for answer in answers)
+            self.columns.append(bytes(column))
+        self.ones = int.from_bytes((b"\x01" + bytes(self.width - 1)) \
+            * len(answers), "little")
+        self.counts = {}
+        self.tables = [bytes(int(value >= number) for value in range(256)) \
+            for number in range(length + 2)]
+        return
+
+    def count(self, letter):
+        """
+        Gives how many times each answer contains a letter, counting it only
+        the first time it is needed.
+
+        Arguments:
+            letter: string
+                the letter to count
+
+        Returns:
+            count: integer
+                has the count for each answer as one lane
+        """
+
+        if letter not in self.counts:
+            table = bytearray(256)
+            if letter in self.letters:
+                table[self.letters[letter]] = 1
+            total = 0
+            for column in self.columns:
+                total += int.from_bytes(column.translate(table), "little")
+            self.counts[letter] = total
+        return self.counts[letter]
+
+    def row(self, guess):
+        """
+        Gives the encoded results of a guess against every answer.
+
+        Arguments:
+            guess: string
+                word being guessed by the wordle solver
+
+        Returns:
+            row: bytes
+                the encoded result against each answer as one little-endian
+                lane each, in answer order
+        """
+
+        size = len(self.answers) * self.width
+        greens = []
+        for index in range(len(guess)):
+            table = bytearray(256)
+            if guess[index] in self.letters:
+                table[self.letters[guess[index]]] = 1
+            greens.append(int.from_bytes(self.columns[index].translate(table),
+                "little"))
+        code = 0
+        for index in range(len(guess)):
+            letter = guess[index]
+            before = guess.count(letter, 0, index)
+            # greens of the same letter later on are matched before this one
+            after = 0
+            for other in range(index + 1, len(guess)):
+                if guess[other] == letter:
+                    after += greens[other]
+            # a yellow needs one more copy than those already matched
+            left = (self.count(letter) - after).to_bytes(size, "little")
+            yellow = int.from_bytes(left.translate(self.tables[before + 1]),
+                "little") & (self.ones ^ greens[index])
+            code += 3 ** index * (2 * greens[index] + yellow)
+        return code.to_bytes(size, "little")
+
+    def rows(self, guesses):
+        """
+        Gives the encoded results of many guesses against every answer.
+
+        Arguments:
+            guesses: list of strings
+                words being guessed by the wordle solver
+
+        Returns:
+            rows: generator of bytes
+                the encoded results of each guess, in guess order
+        """
+
+        return (self.row(guess) for guess in guesses)
+
+    def results(self, guess):
+        """
+        Gives the string of colours of a guess against every answer.
+
+        Arguments:
+            guess: string
+                word being guessed by the wordle solver
+
+        Returns:
+            results: list of strings
+                string of colours against each answer, in answer order
+        """
+
+        row = self.row(guess)
+        patterns = pattern_table(len(guess))
+        return [patterns[int.from_bytes(row[start:start + self.width],
+            "little")] for start in range(0, len(row), self.width)]
+
+
+class FeedbackMatrix():
+    """
+    A class to hold the result of every guess against every possible answer.
+
+    Attributes:
+        guesses: list of strings
+            words that may be guessed, one per row of the matrix
+        answers: list of strings
+            words that may be correct, one per column of the matrix
+        guess_index: dictionary
+            holds the row of each guess
+        answer_index: dictionary
+            holds the column of each answer
+        filename: string
+            name of the cache file the matrix is stored in, or None if it
+            was computed with an oracle other than wordle and never cached
+        width: integer
+            the number of bytes holding each result, more than one only for
+            words of more than five letters
+        data: mmap or bytes
+            the encoded result of each guess-answer pair, row by row
+        codes: memoryview or array
+            the same results read as integers, one per guess-answer pair
+
+    Methods:
+        build(oracle):
+            computes every result and writes the matrix to its cache file
+        compute(oracle):
+            gives the encoded results of every guess, one row at a time
+        load():
+            maps the cache file into memory
+        pattern(guess, answer):
+            gives the encoded result of a guess against an answer
+        result(guess, answer):
+            gives the string of colours of a guess against an answer
+        row(guess):
+            gives the encoded results of a guess against every answer
+    """
+
+    def __init__(self, guesses, answers, oracle=wordle,
+        directory=CACHE_DIRECTORY):
+        """
+        Loads the matrix of two word lists, computing it if not yet cached.
+
+        Arguments:
+            guesses: list of strings
+                words that may be guessed
+            answers: list of strings
+                words that may be correct
+            oracle: function
+                gives the string of colours for a word-guess pair
+            directory: string
+                name of the directory cached matrices are kept in
+
+        Returns:
+            None, but makes the matrix available for lookups
+        """
+
+        self.guesses = guesses
+        self.answers = answers
+        self.guess_index = {guess: index for index, guess \
+            in enumerate(guesses)}
+        self.answer_index = {answer: index for index, answer \
+            in enumerate(answers)}
+
+        self.width = pattern_width(len(guesses[0]) if guesses else LENGTH)
+        if oracle is not wordle:
+            # nothing a digest could hold tells two other oracles apart, so
+            # their results are kept in memory only
+            self.filename = None
+            self.data = b"".join(self.compute(oracle))
+            self.load()
+            return
+
+        # any change to either list or to the oracle needs a new matrix
+        digest = hashlib.sha256()
+        digest.update("{}\n".format(MATRIX_VERSION).encode())
+        digest.update(" ".join(guesses).encode())
+        digest.update(b"\n")
+        digest.update(" ".join(answers).encode())
+        self.filename = os.path.join(directory,
+            "feedback-{}.bin".format(digest.hexdigest()[:16]))
+
+        size = len(guesses) * len(answers) * self.width
+        if not os.path.exists(self.filename) \
+            or os.path.getsize(self.filename) != size:
+            self.build(oracle)
+        self.load()
+        return
+
+    def build(self, oracle):
+        """
+        Computes the result of every guess-answer pair and stores the matrix.
+
+        Arguments:
+            oracle: function
+                gives the string of colours for a word-guess pair
+
+        Returns:
+            None, but writes the matrix to its cache file
+        """
+
+        print("Building feedback matrix of {} by {} words".format(
+            len(self.guesses), len(self.answers)))
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        # write to a temporary file first so a crash never leaves half a matrix
+        partial = self.filename + ".partial"
+        with open(partial, "wb") as outfile:
+            for row in self.compute(oracle):
+                outfile.write(row)
+        os.replace(partial, self.filename)
+        return
+
+    def compute(self, oracle):
+        """
+        Gives the encoded results of every guess against every answer.
+
+        Arguments:
+            oracle: function
+                gives the string of colours for a word-guess pair
+
+        Returns:
+            rows: generator of bytes
+                the encoded results of each guess, in order
+        """
+
+        if oracle is wordle:
+            # whole rows at a time give exactly the same results, faster
+            yield from BatchOracle(self.answers).rows(self.guesses)
+        else:
+            for guess in self.guesses:
+                yield b"".join(encode_pattern(oracle(answer,
+                    guess)).to_bytes(self.width, "little") \
+                    for answer in self.answers)
+        return
+
+    def load(self):
+        """
+        Maps the stored matrix into memory so rows are read only when used.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        if self.filename is None:
+            pass    # computed in memory, never stored
+        elif not os.path.getsize(self.filename):
+            self.data = b""    # empty files cannot be mapped
+        else:
+            with open(self.filename, "rb") as infile:
+                self.data = mmap.mmap(infile.fileno(), 0,
+                    access=mmap.ACCESS_READ)
+        typecode = TYPECODES[self.width]
+        if self.width == 1 or sys.byteorder == "little":
+            self.codes = memoryview(self.data).cast(typecode)
+        else:
+            # wide results are stored little-endian on every machine
+            self.codes = array(typecode, bytes(self.data))
+            self.codes.byteswap()
+        return
+
+    def pattern(self, guess, answer):
+        """
+        Gives the encoded result of a guess against an answer.
+
+        Arguments:
+            guess: string
+                word being guessed by the wordle solver
+            answer: string
+                secret word trying to be cracked
+
+        Returns:
+            code: integer
+                the encoded string of colours
+        """
+
+        return self.codes[self.guess_index[guess] * len(self.answers) \
+            + self.answer_index[answer]]
+
+    def result(self, guess, answer):
+        """
+        Gives the string of colours of a guess against an answer.
+
+        Arguments:
+            guess: string
+                word being guessed by the wordle solver
+            answer: string
+                secret word trying to be cracked
+
+        Returns:
+            result: string
+                string of colours to be interpreted by the solver
+        """
+
+        return pattern_table(len(guess))[self.pattern(guess, answer)]
+
+    def row(self, guess):
+        """
+        Gives the encoded results of a guess against every answer.
+
+        Arguments:
+            guess: string
+                word being guessed by the wordle solver
+
+        Returns:
+            row: memoryview or array of integers
+                the encoded result against each answer, in answer order
+        """
+
+        start = self.guess_index[guess] * len(self.answers)
+        return self.codes[start:start + len(self.answers)]
+
+
+def check_oracle(guesses, answers):
+    """
+    Compares wordle and BatchOracle against reference on every guess-answer
+    pair, and on every known result of repeated letters.
+
+    Arguments:
+        guesses: list of strings
+            words to guess, all the same length as the answers
+        answers: list of strings
+            words that may be correct
+
+    Returns:
+        disagreements: list of tuples of strings
+            the word, the guess and the results of reference, wordle and
+            BatchOracle for every pair they do not all agree on
+    """
+
+    disagreements = []
+    for word, guess, result in KNOWN_RESULTS:
+        found = (reference(word, guess), wordle(word, guess),
+            BatchOracle([word]).results(guess)[0])
+        if found != (result,) * 3:
+            disagreements.append((word, guess) + found)
+    oracle = BatchOracle(answers)
+    for guess in guesses:
+        for word, batch in zip(answers, oracle.results(guess)):
+            expected = reference(word, guess)
+            if wordle(word, guess) != expected or batch != expected:
+                disagreements.append((word, guess, expected,
+                    wordle(word, guess), batch))
+    return disagreements
+
+
+def main():
+    """
+    Checks that every way of giving results agrees on a set of words.
+
+    Arguments:
+        None, but reads the words from a specified file
+
+    Returns:
+        None, but prints every pair the oracles disagree on
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Checks that wordle and BatchOracle give the same "
+        "results as a slow reference on every pair of words.")
+    parser.add_argument("infilename", help="text file of words to guess")
+    parser.add_argument("--answers", metavar="ANSWERFILENAME",
+        help="text file of the answers to check, by default the same words")
+    parser.add_argument("--limit", metavar="N", type=int, default=200,
+        help="check only the first N answers, 0 for all of them")
+    args = parser.parse_args()
+
+    for filename in (args.infilename, args.answers):
+        if filename is not None and not os.path.exists(filename):
+            print("Error: input file specified does not exist.",
+                "Proper Usage: python3 feedback.py <filename>")
+            return
+    with open(args.infilename) as infile:
+        guesses = infile.read().split()
+    with open(args.answers or args.infilename) as infile:
+        answers = infile.read().split()
+    # only words of the most common length can be compared with each other
+    lengths = [len(word) for word in guesses]
+    length = max(set(lengths), key=lengths.count) if guesses else LENGTH
+    guesses = [word for word in guesses if len(word) == length]
+    answers = [word for word in answers if len(word) == length]
+    if args.limit:
+        answers = answers[:args.limit]
+
+    disagreements = check_oracle(guesses, answers)
+    for word, guess, expected, single, batch in disagreements:
+        print("{} guessed against {}: reference {}, wordle {}, "
+            "BatchOracle {}".format(guess, word, expected, single, batch))
+    print("CHECKED {} PAIRS AND {} KNOWN RESULTS, {} DISAGREED".format(
+        len(guesses) * len(answers), len(KNOWN_RESULTS), len(disagreements)))
+    return
+
+
+if __name__ == "__main__":
+    main()
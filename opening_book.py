@@ -0,0 +1,186 @@
+# Made by Isaac Joffe
+
+import os    # to replace files atomically
+import json    # to store the book in a readable format
+import hashlib    # to tell when the words a book was built from change
+
+# to give results of guesses
+from feedback import wordle, MATRIX_VERSION, LENGTH
+
+
+BOOK_VERSION = 2    # bump whenever the solver changes which guesses it makes
+
+
+def history_key(history):
+    """
+    Gives the text used to look up a history of guesses in an opening book.
+
+    Arguments:
+        history: list of tuples of strings
+            every guess made so far along with its result
+
+    Returns:
+        key: string
+            each guess and its result, in order
+    """
+
+    return " ".join("{}:{}".format(guess, result) \
+        for guess, result in history)
+
+
+class OpeningBook():
+    """
+    A class to hold the guess a game makes after every reachable history of
+    guesses up to a certain depth, stored next to the word list it is for.
+
+    Attributes:
+        filename: string
+            name of the file the book is stored in
+        strategy: string
+            how the guesses in the book were chosen
+        depth: integer
+            the number of guesses in each game covered by the book
+        digest: string
+            a hash of everything the guesses in the book depend on
+        guesses: dictionary
+            holds the guess to make after each history of guesses
+
+    Methods:
+        build(game):
+            plays out every reachable opening to find each guess
+        load():
+            reads the book from its file if it is still valid
+        save():
+            writes the book to its file
+    """
+
+    def __init__(self, infilename, game, depth=2):
+        """
+        Loads the book for a word list, building it again if the words or the
+        way guesses are chosen have changed since it was stored.
+
+        Arguments:
+            infilename: string
+                the name of the file containing all possible words
+            game: Game
+                a new game, with no opening book, to play out openings from
+            depth: integer
+                the number of guesses in each game to cover
+
+        Returns:
+            None, but makes the book available for lookups
+        """
+
+        hard = game.pool is not None    # hard mode follows other openings
+        # words of each length in the same file get a book of their own
+        length = game.words.length
+        self.filename = "{}{}.{}{}.book".format(infilename,
+            "" if length == LENGTH else ".{}".format(length), game.strategy,
+            ".hard" if hard else "")
+        self.strategy = game.strategy
+        self.depth = depth
+        digest = hashlib.sha256()
+        digest.update("{} {} {} {} {}\n".format(BOOK_VERSION, MATRIX_VERSION,
+            self.strategy, depth, hard).encode())
+        # a different policy makes different guesses
+        digest.update(json.dumps(game.policy.describe(),
+            sort_keys=True).encode())
+        digest.update(" ".join(game.words.words).encode())
+        if game.words.priors is not None:
+            # likelier words are guessed sooner
+            digest.update(json.dumps(list(game.words.priors)).encode())
+        self.digest = digest.hexdigest()
+
+        self.guesses = {}
+        if depth > 0 and not self.load():
+            self.build(game)
+            self.save()
+        return
+
+    def build(self, game):
+        """
+        Plays out every opening that can be reached from a new game, one
+        guess at a time, noting the guess made after each history.
+
+        Arguments:
+            game: Game
+                a new game, with no opening book, to play out openings from
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        # imported here, as wordle_solver imports this module in turn
+        from wordle_solver import bits_to_indices
+
+        print("Building opening book of depth {} for the {} strategy".format(
+            self.depth, self.strategy))
+        words = game.words.words
+        games = [game.copy()]
+        for level in range(self.depth):
+            following = []
+            for game in games:
+                answers = [words[index] for index \
+                    in bits_to_indices(game.candidates)]
+                guess = game.next_guess()
+                self.guesses[history_key(game.history)] = guess
+                if level + 1 == self.depth:
+                    continue    # no need to find results that are not used
+                # follow each different result a possible word would give
+                for result in sorted({wordle(answer, guess) \
+                    for answer in answers}):
+                    if result == "g" * len(guess):
+                        continue    # the game is already over
+                    branch = game.copy()
+                    branch.update(guess, result)
+                    if branch.count():
+                        following.append(branch)
+            games = following
+        return
+
+    def load(self):
+        """
+        Reads the book from its file, as long as it was built from the same
+        words in the same way.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            loaded: boolean
+                whether a valid book was read
+        """
+
+        try:
+            with open(self.filename) as infile:
+                data = json.load(infile)
+        except (OSError, ValueError):
+            return False
+        if data.get("digest") != self.digest:
+            return False    # the words or the solver have changed
+        self.guesses = data["guesses"]
+        return True
+
+    def save(self):
+        """
+        Writes the book to its file, if the file can be written at all.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            None, but creates a file containing the book
+        """
+
+        data = {"version": BOOK_VERSION, "digest": self.digest,
+            "strategy": self.strategy, "depth": self.depth,
+            "guesses": self.guesses}
+        partial = self.filename + ".partial"
+        try:
+            with open(partial, "w") as outfile:
+                json.dump(data, outfile, indent=0, sort_keys=True)
+            os.replace(partial, self.filename)
+        except OSError:
+            pass    # the book still works, it just has to be built next time
+        return
+
@@ -0,0 +1,151 @@
+# Made by Isaac Joffe
+
+import os    # to check for and replace policy files
+import json    # to store policies in a readable format
+
+from feedback import LENGTH    # to name the policy of other lengths apart
+
+
+class ThresholdPolicy():
+    """
+    A class to decide when to stop probing with the most valuable word and
+    start guessing words that may be correct, once few enough are left.
+
+    Attributes:
+        ratio: float
+            the share of all words that may be left while still probing
+        offset: float
+            the number of words added to that share
+
+    Methods:
+        probe(game):
+            decides whether to probe rather than guess a possible word
+        describe():
+            gives the settings of the policy
+    """
+
+    name = "threshold"
+
+    def __init__(self, ratio=1 / 500, offset=1):
+        """
+        Sets up the policy.
+
+        Arguments:
+            ratio: float
+                the share of all words that may be left while still probing
+            offset: float
+                the number of words added to that share
+
+        Returns:
+            None, but sets up the policy
+        """
+
+        self.ratio = ratio
+        self.offset = offset
+        return
+
+    def probe(self, game):
+        """
+        Decides whether to probe with the most valuable word, rather than
+        guess a word that may be correct.
+
+        Arguments:
+            game: Game
+                what is known about the game so far
+
+        Returns:
+            probe: boolean
+                whether too many words are left to guess one of them
+        """
+
+        return game.count() > len(game.words.words) * self.ratio + self.offset
+
+    def describe(self):
+        """
+        Gives the settings of the policy, from which it can be made again.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            settings: dictionary
+                the name of the policy along with its settings
+        """
+
+        return {"policy": self.name, "ratio": self.ratio,
+            "offset": self.offset}
+
+
+# every kind of policy, by the name stored in policy files
+POLICIES = {ThresholdPolicy.name: ThresholdPolicy}
+
+
+def policy_filename(infilename, length=LENGTH, strategy="frequency",
+    hard=False):
+    """
+    Gives the name of the file the policy of one way of playing is stored in,
+    next to the words, so tuning one way of playing leaves the others alone.
+
+    Arguments:
+        infilename: string
+            the name of the file containing all possible words
+        length: integer
+            number of letters in each word
+        strategy: string
+            how the next guess is chosen
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+
+    Returns:
+        filename: string
+            name of the policy file, such as words.txt.frequency.hard.policy
+    """
+
+    return "{}{}.{}{}.policy".format(infilename,
+        "" if length == LENGTH else ".{}".format(length), strategy,
+        ".hard" if hard else "")
+
+
+def load_policy(filename):
+    """
+    Reads a policy from a file, using the default policy if there is none.
+
+    Arguments:
+        filename: string
+            name of the file the policy is stored in
+
+    Returns:
+        policy: ThresholdPolicy
+            the policy described by the file
+    """
+
+    if not os.path.exists(filename):
+        return ThresholdPolicy()
+    try:
+        with open(filename) as infile:
+            settings = json.load(infile)
+        kind = POLICIES[settings.pop("policy")]
+        return kind(**settings)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise ValueError("{} is not a valid policy file".format(filename))
+
+
+def save_policy(policy, filename):
+    """
+    Writes a policy to a file, replacing any policy already there.
+
+    Arguments:
+        policy: ThresholdPolicy
+            the policy to store
+        filename: string
+            name of the file to store the policy in
+
+    Returns:
+        None, but creates a file containing the policy
+    """
+
+    partial = filename + ".partial"
+    with open(partial, "w") as outfile:
+        json.dump(policy.describe(), outfile, indent=4)
+    os.replace(partial, filename)
+    return
@@ -0,0 +1,216 @@
+# Made by Isaac Joffe
+
+import time    # to keep each search within its time budget
+from operator import itemgetter    # to pick out the results of some words
+
+
+ATTEMPTS = 6    # number of guesses Wordle allows
+SEARCH_SIZE = 100    # most possible words to search over
+SEARCH_CACHE_SIZE = 65536    # most sets of words to remember the solution of
+
+
+class SearchTimeout(Exception):
+    """
+    Raised when a search runs out of time before finding an answer.
+    """
+
+
+class Search():
+    """
+    A class to make sure every word that may still be correct can be solved
+    within the guesses left, by searching every guess and every result once
+    few enough words are left.
+
+    Attributes:
+        words: WordSet
+            the data on all possible words
+        budget: float
+            the most seconds to spend searching on each turn
+        size: integer
+            the most possible words to search over
+        solutions: dictionary
+            holds the guess solving each set of words within a number of
+            guesses, or None if no guess can, shared by every game
+        deadline: float
+            the time the current search must finish by
+        solved: integer
+            the encoded result of a correct guess, all green
+
+    Methods:
+        guess(candidates, left, index, hard):
+            gives a guess sure to solve every possible word in time
+        solve(candidates, left, hard):
+            gives the guess solving a set of words in time, if any can
+        safe(guess, candidates, left, hard):
+            decides whether a guess is sure to solve a set of words in time
+        split(guess, candidates):
+            gives the possible words left after each result of a guess
+    """
+
+    def __init__(self, words, budget=1.0, size=SEARCH_SIZE):
+        """
+        Sets up the search.
+
+        Arguments:
+            words: WordSet
+                the data on all possible words
+            budget: float
+                the most seconds to spend searching on each turn
+            size: integer
+                the most possible words to search over
+
+        Returns:
+            None, but sets up the search
+        """
+
+        self.words = words
+        self.budget = budget
+        self.size = size
+        self.solutions = {}
+        self.deadline = None
+        self.solved = 3 ** words.length - 1
+        return
+
+    def guess(self, candidates, left, index, hard=False):
+        """
+        Gives a guess sure to solve every possible word within the guesses
+        left, keeping the guess already chosen whenever it is.
+
+        Arguments:
+            candidates: list of integers
+                the indices of the words that may be correct, in order
+            left: integer
+                the number of guesses left, including this one
+            index: integer
+                the index of the guess already chosen
+            hard: boolean
+                whether only words that may be correct can be guessed
+
+        Returns:
+            index: integer
+                the index of the guess to make, the one already chosen if no
+                guess is sure to do better or the search ran out of time
+        """
+
+        if len(candidates) > self.size or left < 1:
+            return index    # too many words to search, or too late to help
+        self.deadline = time.perf_counter() + self.budget
+        candidates = tuple(candidates)
+        try:
+            if self.safe(index, candidates, left, hard):
+                return index
+            solution = self.solve(candidates, left, hard)
+        except SearchTimeout:
+            return index
+        return index if solution is None else solution
+
+    def solve(self, candidates, left, hard=False):
+        """
+        Gives the guess solving every word of a set within the guesses left,
+        trying likely guesses first and remembering every set it finishes.
+
+        Arguments:
+            candidates: tuple of integers
+                the indices of the words that may be correct, in order
+            left: integer
+                the number of guesses left, including this one
+            hard: boolean
+                whether only words that may be correct can be guessed
+
+        Returns:
+            index: integer
+                the index of the guess to make, or None if no guess is sure to
+                solve every word in time
+        """
+
+        # guessing the words one at a time always works with enough guesses
+        if len(candidates) <= left:
+            return candidates[0]
+        if left < 2:
+            return None
+        key = (candidates, left, hard)
+        if key in self.solutions:
+            return self.solutions[key]
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        # words with the most results are tried first, and between those
+        # splitting the words equally, those that may be correct
+        possible = set(candidates)
+        pick = itemgetter(*candidates)
+        view = self.words.feedback().codes
+        total = len(self.words.words)
+        ranked = []
+        for index in candidates if hard else range(total):
+            # ranking every word can take longer than the budget on its own
+            if time.perf_counter() > self.deadline:
+                raise SearchTimeout()
+            groups = len(set(pick(view[index * total:(index + 1) * total])))
+            # a guess with one result for every word learns nothing, and with
+            # two guesses left every result must leave one word
+            if groups > 1 and (left > 2 or groups == len(candidates)):
+                ranked.append((-groups, index not in possible, index))
+        ranked.sort()
+        solution = None
+        for groups, impossible, index in ranked:
+            if self.safe(index, candidates, left, hard):
+                solution = index
+                break
+
+        if len(self.solutions) >= SEARCH_CACHE_SIZE:
+            self.solutions.clear()    # bounded, however long the run
+        self.solutions[key] = solution
+        return solution
+
+    def safe(self, guess, candidates, left, hard=False):
+        """
+        Decides whether a guess is sure to solve every word of a set within
+        the guesses left, whatever its result.
+
+        Arguments:
+            guess: integer
+                the index of the word to guess
+            candidates: tuple of integers
+                the indices of the words that may be correct, in order
+            left: integer
+                the number of guesses left, including this one
+            hard: boolean
+                whether only words that may be correct can be guessed
+
+        Returns:
+            safe: boolean
+                whether every result leaves words that can be solved in time
+        """
+
+        groups = self.split(guess, candidates)
+        groups.pop(self.solved, None)    # a correct guess needs nothing more
+        if any(len(group) == len(candidates) for group in groups.values()):
+            return False    # the guess learns nothing
+        # the largest groups are the likeliest to fail, so try them first
+        for group in sorted(groups.values(), key=len, reverse=True):
+            if self.solve(tuple(group), left - 1, hard) is None:
+                return False
+        return True
+
+    def split(self, guess, candidates):
+        """
+        Gives the words left after each result of a guess.
+
+        Arguments:
+            guess: integer
+                the index of the word to guess
+            candidates: tuple of integers
+                the indices of the words that may be correct, in order
+
+        Returns:
+            groups: dictionary
+                holds the indices of the words giving each encoded result,
+                in order
+        """
+
+        total = len(self.words.words)
+        data = self.words.feedback().codes
+        groups = {}
+        for index in candidates:
+            groups.setdefault(data[guess * total + index], []).append(index)
+        return groups
@@ -2,7 +2,16 @@
 
 import sys    # for command line arguments
 import os.path    # to check that file exists
-import pickle    # to serialize data
+import struct    # to lay out the header of the index
+import zlib    # to checksum the index
+
+
+INDEX_MAGIC = b"WORDIDX\0"    # first bytes of every binary index
+INDEX_VERSION = 2    # bump whenever the layout of the index changes
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"    # letters words are made of
+# magic, version, letters per word, number of words, letters in the
+# alphabet and checksum of everything after the header
+INDEX_HEADER = struct.Struct("<8sHHIII")
 
 
 class WordSet():
@@ -23,8 +32,8 @@ class WordSet():
             calculates the value of a word based on how common its letters are
         sort_by_value():
             sorts the list of words based on their value
-        pickle(filename):
-            serializes the list of words and their data
+        write_index(filename):
+            serializes the list of words and their data as a binary index
     """
 
     def __init__(self, filename):
@@ -46,7 +55,7 @@ class WordSet():
         self.count_letters()
         self.count_frequencies()
         self.sort_by_value()
-        self.pickle(filename)
+        self.write_index(filename)
         return
 
     def get_base_words(self, filename):
@@ -142,9 +151,10 @@ class WordSet():
         self.wordset.sort(reverse=True, key=word_value_key)
         return
 
-    def pickle(self, filename):
+    def write_index(self, filename):
         """
-        Serializes all word data into a file for other programs to use.
+        Serializes all word data into a versioned, checksummed binary index
+        for other programs to use, in the same format as the main solver.
 
         Arguments:
             filename: string
@@ -154,9 +164,65 @@ class WordSet():
             None, but creates a serialized version of the data in a file
         """
 
-        outfilename = filename + ".pkl"    # add suffix to original name
+        words = [element['word'] for element in self.wordset]
+        size = len(words)
+        length = len(words[0]) if words else 0
+        if any(len(word) != length for word in words):
+            raise ValueError("all words in an index must have the same length")
+        width = (size + 7) // 8    # bytes in each set of words
+        # letters outside a to z are coded after them, in order
+        alphabet = ALPHABET + "".join(sorted(set("".join(words)) \
+            - set(ALPHABET)))
+        letters = len(alphabet)
+        if letters > 64:
+            raise ValueError("words use more than 64 different letters")
+
+        codes = [bytearray(size) for number in range(length)]
+        distinct = [bytearray(size) for number in range(length)]
+        counts = bytearray(size * letters)
+        masks = []
+        letter_bits = [0] * letters
+        position_bits = [[0] * letters for number in range(length)]
+        for index, word in enumerate(words):
+            mask = 0
+            for number, letter in enumerate(word):
+                code = alphabet.index(letter)
+                codes[number][index] = code
+                counts[index * letters + code] += 1
+                # double letters are coded past the alphabet so they are not
+                # counted twice
+                distinct[number][index] = letters \
+                    if mask >> code & 1 else code
+                position_bits[number][code] |= 1 << index
+                mask |= 1 << code
+            masks.append(mask)
+            for code in range(letters):
+                if mask >> code & 1:
+                    letter_bits[code] |= 1 << index
+
+        sections = [
+            "".join(words).encode('utf-32-le'),
+            alphabet.encode('utf-32-le'),
+            b"".join(bytes(column) for column in codes),
+            b"".join(bytes(column) for column in distinct),
+            bytes(counts),
+            struct.pack("<{}Q".format(size), *masks),
+            struct.pack("<{}i".format(size),
+                *[element['value'] for element in self.wordset]),
+            b"".join(bits.to_bytes(width, 'little') for bits in letter_bits),
+            b"".join(bits.to_bytes(width, 'little') \
+                for letters in position_bits for bits in letters),
+        ]
+        # every section is padded to a multiple of eight bytes
+        payload = b"".join(section + bytes(-len(section) % 8) \
+            for section in sections)
+        header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, length, size,
+            letters, zlib.crc32(payload))
+
+        outfilename = filename + ".idx"    # add suffix to original name
         with open(outfilename, 'wb') as outfile:
-            pickle.dump(self.wordset, outfile)
+            outfile.write(header)
+            outfile.write(payload)
         return
 
 
@@ -2,23 +2,68 @@
 
 import sys    # for command line arguments
 import os.path    # to check that file exists
-import pickle    # to serialize data
+import struct    # to read the header of the index
+import zlib    # to check the index is not corrupted
 
 
-def depickle(filename):
+INDEX_MAGIC = b"WORDIDX\0"    # first bytes of every binary index
+INDEX_VERSION = 2    # the only layout of the index this program can read
+# magic, version, letters per word, number of words, letters in the
+# alphabet and checksum of everything after the header
+INDEX_HEADER = struct.Struct("<8sHHIII")
+
+
+def read_index(filename):
     """
     Reads serialized data on the set of words into memory.
 
     Arguments:
         filename: string
-            name of the pickled file to read from
+            name of the binary index file to read from
 
     Returns:
-        None, but reads the data into a vraible
+        words: list of dictionaries
+            contains all valid Wordle words along with data on what letters
+            the word conatins and how useful the word is
     """
 
     with open(filename, 'rb') as infile:
-        words = pickle.load(infile)
+        data = infile.read()
+    if len(data) < INDEX_HEADER.size:
+        raise ValueError("{} is not a word index".format(filename))
+    magic, version, length, size, letters, checksum = \
+        INDEX_HEADER.unpack_from(data)
+    if magic != INDEX_MAGIC:
+        raise ValueError("{} is not a word index".format(filename))
+    if version != INDEX_VERSION:
+        raise ValueError("{} is an unsupported word index version".format(
+            filename))
+    if zlib.crc32(data[INDEX_HEADER.size:]) != checksum:
+        raise ValueError("{} is a corrupted word index".format(filename))
+
+    # only the words, the alphabet, their letter counts and their values
+    # are needed here, which are the first, second, fifth and seventh
+    # sections of the index
+    def padded(section):
+        return section + -section % 8
+
+    start = INDEX_HEADER.size
+    text = data[start:start + size * length * 4].decode('utf-32-le')
+    start += padded(size * length * 4)
+    alphabet = data[start:start + letters * 4].decode('utf-32-le')
+    start += padded(letters * 4) + 2 * padded(length * size)
+    counts = data[start:start + size * letters]
+    start += padded(size * letters) + padded(size * 8)
+    values = struct.unpack_from("<{}i".format(size), data, start)
+
+    words = []
+    for index in range(size):
+        found = {}
+        for code in range(letters):
+            if counts[index * letters + code]:
+                found[alphabet[code]] = counts[index * letters + code]
+        words.append({'word': text[index * length:(index + 1) * length],
+            'letters': found, 'value': values[index]})
     return words
 
 
@@ -129,7 +174,11 @@ def main():
             "Proper Usage: <python3 wordle_solver.py <filename>>")
         return
 
-    words = depickle(infilename)    # read data on set of possible words
+    try:
+        words = read_index(infilename)    # read data on set of possible words
+    except ValueError as error:
+        print("Error: {}.".format(error))
+        return
     wordle_solve(words)    # solve particular instance of the game
     return
 
@@ -0,0 +1,327 @@
+# Made by Isaac Joffe
+
+import sys    # to write results to standard out
+import os    # to check that file exists
+import argparse    # for command line arguments
+import json    # to write results as lines of JSON
+import contextlib    # to keep progress messages out of the results
+import csv    # to write results as comma separated values
+import time    # to time each game
+import multiprocessing    # to play many games at once
+from itertools import islice    # to hand games to workers a few at a time
+
+from feedback import wordle    # to give results of guesses
+from wordle_solver import WordSet, Game, STRATEGIES    # to solve games
+# to load the words once in each process
+from wordle_solver import start_worker, worker_data
+from opening_book import OpeningBook    # to look up opening guesses
+
+
+# every column of a result, in the order they are written
+FIELDS = ("game", "answer", "attempts", "solved", "guesses", "patterns",
+    "suggestions", "seconds", "error")
+CHUNK_SIZE = 256    # games handed to each worker process at a time
+
+
+def read_games(infile):
+    """
+    Reads the games to play one at a time, so the file is never held in
+    memory all at once.
+
+    Arguments:
+        infile: file
+            holds secret words separated by spaces, or one recorded game per
+            line
+
+    Returns:
+        games: generator of strings
+            each secret word or recorded game, in order
+    """
+
+    for line in infile:
+        if ":" in line:
+            yield line.strip()    # the whole line is one recorded game
+        else:
+            yield from line.split()
+    return
+
+
+def play(line, words, strategy=STRATEGIES[0], book=None, hard=False):
+    """
+    Plays a single game, either solving a secret word or following a
+    recorded game to note what the solver would have suggested instead.
+
+    Arguments:
+        line: string
+            a secret word, or a recorded game as guesses along with their
+            results, written like "aeros:bbygb unity:ggggg"
+        words: WordSet
+            the data on all possible words, shared so it is only read once
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        book: dictionary
+            holds the guess to make after each history of guesses
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+
+    Returns:
+        record: dictionary
+            the answer, every guess and result, and the number of attempts,
+            along with what was wrong with the line if it could not be played
+    """
+
+    start = time.time()
+    game = Game(words, strategy, book, hard)    # what is known about this game
+    fields = line.split()
+    answer = None
+    guesses = []
+    patterns = []
+    suggestions = []
+    try:
+        follow(game, fields, guesses, patterns, suggestions)
+    except ValueError as error:
+        # one bad line is noted rather than stopping every game after it
+        secret = len(fields) == 1 and ":" not in fields[0]
+        return {"answer": fields[0] if secret else None,
+            "attempts": len(guesses), "solved": False, "guesses": guesses,
+            "patterns": patterns, "suggestions": suggestions,
+            "seconds": round(time.time() - start, 6), "error": str(error)}
+    if patterns and patterns[-1] == "g" * len(patterns[-1]):
+        answer = guesses[-1]
+    elif len(fields) == 1 and ":" not in fields[0]:
+        answer = fields[0]
+    solved = bool(patterns) and patterns[-1] == "g" * len(patterns[-1])
+    return {"answer": answer, "attempts": len(guesses), "solved": solved,
+        "guesses": guesses, "patterns": patterns, "suggestions": suggestions,
+        "seconds": round(time.time() - start, 6)}
+
+
+def follow(game, fields, guesses, patterns, suggestions):
+    """
+    Plays out a single game, noting every guess and result as it goes so
+    they are kept even if the game cannot be finished.
+
+    Arguments:
+        game: Game
+            a new game to play
+        fields: list of strings
+            a secret word, or every guess of a recorded game along with its
+            result, written like "aeros:bbygb"
+        guesses: list of strings
+            every word guessed so far, added to as the game is played
+        patterns: list of strings
+            the result of every guess so far, added to as the game is played
+        suggestions: list of strings
+            the word the solver would have guessed instead of each recorded
+            guess, added to as the game is followed
+
+    Returns:
+        None, but updates the lists given
+    """
+
+    words = game.words
+    if len(fields) == 1 and ":" not in fields[0]:
+        answer = fields[0]
+        if len(answer) != words.length \
+            or not set(answer) <= set(words.alphabet):
+            raise ValueError("{} is not a word of {} letters".format(answer,
+                words.length))
+        # keep guessing until the word is found or no words are left
+        while game.count() and len(guesses) < 28:
+            guesses.append(game.next_guess())
+            patterns.append(wordle(answer, guesses[-1]))
+            if patterns[-1] == "g" * len(answer):
+                break
+            game.update(guesses[-1], patterns[-1])
+    else:
+        for field in fields:
+            guess, colon, result = field.partition(":")
+            if not colon or len(guess) != len(result):
+                raise ValueError("{} is not a guess and its result".format(
+                    field))
+            # note what would have been guessed, then follow what was guessed
+            suggestion = game.copy().next_guess() if game.count() else None
+            game.replay([(guess, result)])
+            suggestions.append(suggestion)
+            guesses.append(guess)
+            patterns.append(result)
+            if result == "g" * len(result):
+                break
+    return
+
+
+def play_line(line):
+    """
+    Plays a single game using the data loaded by start_worker, with the
+    strategy, book and mode of the batch.
+
+    Arguments:
+        line: string
+            a secret word, or a recorded game
+
+    Returns:
+        record: dictionary
+            the answer, every guess and result, and the number of attempts
+    """
+
+    return play(line, worker_data["words"], worker_data["strategy"],
+        worker_data["book"], worker_data["hard"])
+
+
+def write_record(outfile, writer, record):
+    """
+    Writes the result of a game straight away, so nothing is held until the
+    end of the batch.
+
+    Arguments:
+        outfile: file
+            where results are written
+        writer: csv.DictWriter
+            writes rows of comma separated values, or None for JSON
+        record: dictionary
+            the result of the game
+
+    Returns:
+        None, but writes a line to the output
+    """
+
+    if writer is None:
+        outfile.write(json.dumps(record) + "\n")
+    else:
+        row = dict(record)
+        for field in ("guesses", "patterns", "suggestions"):
+            row[field] = " ".join(word or "" for word in record[field])
+        writer.writerow(row)
+    outfile.flush()
+    return
+
+
+def batch(infilename, answerfilename, outfile, form="jsonl", jobs=1,
+    strategy=STRATEGIES[0], depth=2, hard=False, length=None):
+    """
+    Plays a game for every line of a file, writing the result of each game
+    as soon as it finishes.
+
+    Arguments:
+        infilename: string
+            the name of the file containing all possible words
+        answerfilename: string
+            the name of the file of secret words separated by spaces, or of
+            recorded games, one per line
+        outfile: file
+            where results are written
+        form: string
+            "jsonl" for lines of JSON or "csv" for comma separated values
+        jobs: integer
+            the number of processes to play games with at once
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        depth: integer
+            the number of opening guesses to look up rather than work out
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+        length: integer
+            number of letters in each word, by default the length of most
+            possible words, with secret words of other lengths left out
+
+    Returns:
+        None, but writes the result of every game
+    """
+
+    # may be a text file or a binary index
+    words = WordSet(infilename, length)
+    book = OpeningBook(infilename, Game(words, strategy, hard=hard),
+        depth).guesses
+    writer = None
+    if form == "csv":
+        writer = csv.DictWriter(outfile, FIELDS)
+        writer.writeheader()
+
+    with open(answerfilename) as infile:
+        # games are read only as they are played, however long the file is
+        lines = (line for line in read_games(infile) \
+            if ":" in line or len(line) == words.length)
+        if jobs > 1:
+            pool = multiprocessing.Pool(jobs, start_worker, (infilename,
+                words.length, None, {"strategy": strategy, "book": book,
+                "hard": hard}))
+            records = (record for chunk in iter(
+                lambda: list(islice(lines, jobs * CHUNK_SIZE)), []) \
+                for record in pool.imap(play_line, chunk, CHUNK_SIZE // 4))
+        else:
+            records = (play(line, words, strategy, book, hard) \
+                for line in lines)
+        for number, record in enumerate(records):
+            record["game"] = number + 1
+            write_record(outfile, writer, record)
+        if jobs > 1:
+            pool.close()
+            pool.join()
+    return
+
+
+def main():
+    """
+    Plays every game in a file, writing the result of each as it finishes.
+
+    Arguments:
+        None, but reads the data of valid words and games from files
+
+    Returns:
+        None, but writes the result of every game
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Plays a game of Wordle for every secret word, or follows "
+        "every recorded game, in a file, writing the result of each game as "
+        "soon as it finishes.")
+    parser.add_argument("answerfilename", help="file of secret words, or of "
+        "recorded games written like aeros:bbygb unity:ggggg, one per line")
+    parser.add_argument("infilename", help="file of all possible words")
+    parser.add_argument("--output", metavar="OUTFILENAME",
+        help="file to write results to, standard out if not given")
+    parser.add_argument("--format", choices=("jsonl", "csv"),
+        help="how to write results, by default from the output file name")
+    parser.add_argument("--jobs", type=int, default=1,
+        help="number of processes to play games with, 0 for one per core")
+    parser.add_argument("--strategy", choices=STRATEGIES,
+        default=STRATEGIES[0], help="how to choose the next guess")
+    parser.add_argument("--book-depth", metavar="N", type=int, default=2,
+        help="number of opening guesses to precompute and store, 0 for none")
+    parser.add_argument("--hard", action="store_true",
+        help="only make guesses using every hint revealed so far")
+    parser.add_argument("--length", metavar="N", type=int,
+        help="only use words of N letters, by default the length of most "
+        "possible words, leaving out secret words of other lengths")
+    args = parser.parse_args()
+
+    # check that the specified files exist
+    if not os.path.exists(args.answerfilename) \
+        or not os.path.exists(args.infilename):
+        print("Error: input file specified does not exist.",
+            "Proper Usage: python3 wordle_batch.py <filename> <filename>",
+            "[--output <filename>]", file=sys.stderr)
+        return
+    form = args.format
+    if form is None:
+        form = "csv" if (args.output or "").endswith(".csv") else "jsonl"
+    jobs = args.jobs or os.cpu_count()
+
+    outfile = sys.stdout
+    try:
+        if args.output:
+            outfile = open(args.output, "w", newline="")
+        # anything printed along the way must not be mistaken for a result
+        with contextlib.redirect_stdout(sys.stderr):
+            batch(args.infilename, args.answerfilename, outfile, form, jobs,
+                args.strategy, args.book_depth, args.hard, args.length)
+    except (OSError, ValueError) as error:
+        print("Error: {}.".format(error), file=sys.stderr)
+    finally:
+        if outfile is not sys.stdout:
+            outfile.close()
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# Made by Isaac Joffe
+
+import sys    # to write results to standard out
+import os    # to check that file exists and remove temporary files
+import argparse    # for command line arguments
+import json    # to write results in a machine readable format
+import platform    # to note what the benchmark ran on
+import random    # to pick the same words of each size every run
+import tempfile    # to hold the words of each size in a file
+import time    # to time each phase
+
+from feedback import wordle, BatchOracle    # to give results of guesses
+from constraints import Constraints    # to hold what results have revealed
+from wordle_solver import WordSet, Game    # to build and filter words
+
+
+BENCHMARK_VERSION = 1    # bump whenever phases are measured differently
+OPENERS = ("aeros", "unity")    # guesses used to reach states to filter
+
+
+def measure(function, repeat):
+    """
+    Times a function, keeping the fastest of several runs since slower runs
+    only measure whatever else the computer was doing.
+
+    Arguments:
+        function: function
+            takes no arguments and does the work to time
+        repeat: integer
+            the number of times to run the function
+
+    Returns:
+        seconds: float
+            the time the fastest run took
+    """
+
+    best = float("inf")
+    for number in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_phases(filename, repeat):
+    """
+    Times each step of building the data on a set of words.
+
+    Arguments:
+        filename: string
+            name of the text file to read words from
+        repeat: integer
+            the number of times to run each step
+
+    Returns:
+        phases: dictionary
+            holds the seconds each step took
+    """
+
+    phases = {}
+    for number in range(repeat):
+        # the steps are run in order on an empty set, as the constructor does
+        words = WordSet.__new__(WordSet)
+        # counted once and handed on, so set_values is timed on its own
+        counted = {}
+        steps = (("get_base_words", lambda: words.get_base_words(filename)),
+            ("count_letters", words.count_letters),
+            ("count_frequencies", lambda: counted.update(
+                frequencies=words.count_frequencies())),
+            ("set_values", lambda: words.set_values(counted["frequencies"])),
+            ("sort_by_value", words.sort_by_value),
+            ("index_words", words.index_words))
+        for name, step in steps:
+            start = time.perf_counter()
+            step()
+            phases[name] = min(phases.get(name, float("inf")),
+                time.perf_counter() - start)
+    return phases
+
+
+def solve_phases(words, answers, repeat):
+    """
+    Times filtering, scoring and giving results, along with whole games,
+    over a sample of secret words.
+
+    Arguments:
+        words: WordSet
+            the data on all possible words
+        answers: list of strings
+            secret words to play against
+        repeat: integer
+            the number of times to run each phase
+
+    Returns:
+        phases: dictionary
+            holds the seconds each phase took, for all answers together
+    """
+
+    guesses = [guess for guess in OPENERS if len(guess) == words.length]
+    states = []
+    for answer in answers:
+        constraints = Constraints(words.length)
+        for guess in guesses:
+            constraints = constraints.add(guess, wordle(answer, guess))
+        states.append(constraints)
+
+    def filter_all():
+        for constraints in states:
+            words.filtered.clear()    # measure the work, not the cache
+            words.filter_words(constraints)
+        return
+
+    def score_all():
+        for answer in answers:
+            words.get_scores(words.frequencies)
+        return
+
+    def oracle_all():
+        for guess in answers:
+            for answer in answers:
+                wordle(answer, guess)
+        return
+
+    def batch_all():
+        oracle = BatchOracle(answers)
+        for guess in answers:
+            oracle.row(guess)
+        return
+
+    def solve_all():
+        words.filtered.clear()
+        words.choices.clear()
+        for answer in answers:
+            game = Game(words)
+            while game.count():
+                guess = game.next_guess()
+                result = wordle(answer, guess)
+                if result == "g" * len(result):
+                    break
+                game.update(guess, result)
+        return
+
+    return {"filter_words": measure(filter_all, repeat),
+        "get_scores": measure(score_all, repeat),
+        "wordle": measure(oracle_all, repeat),
+        "batch_oracle": measure(batch_all, repeat),
+        "solve": measure(solve_all, repeat)}
+
+
+def benchmark(infilename, sizes, samples=200, repeat=3):
+    """
+    Measures every phase of the solver over sets of words of several sizes.
+
+    Arguments:
+        infilename: string
+            the name of the file containing all possible words
+        sizes: list of integers
+            the numbers of words to measure with, each taken from the file
+        samples: integer
+            the number of secret words to play against for each size
+        repeat: integer
+            the number of times to run each phase
+
+    Returns:
+        results: dictionary
+            describes the run along with the seconds of each phase at each
+            size
+    """
+
+    with open(infilename) as infile:
+        every = infile.read().split()
+    results = {"version": BENCHMARK_VERSION, "words": infilename,
+        "python": platform.python_version(), "machine": platform.machine(),
+        "samples": samples, "repeat": repeat, "sizes": []}
+    for size in sizes:
+        size = min(size, len(every))
+        # the same words are picked every run, in their original order
+        chosen = sorted(random.Random(size).sample(range(len(every)), size))
+        chosen = [every[index] for index in chosen]
+        handle, filename = tempfile.mkstemp(suffix=".txt")
+        try:
+            with os.fdopen(handle, "w") as outfile:
+                outfile.write(" ".join(chosen))
+            phases = build_phases(filename, repeat)
+            words = WordSet(filename)
+        finally:
+            os.remove(filename)
+        answers = random.Random(0).sample(chosen, min(samples, size))
+        phases.update(solve_phases(words, answers, repeat))
+        results["sizes"].append({"size": size, "phases": phases})
+    return results
+
+
+def compare(old, new):
+    """
+    Prints how much faster or slower each phase became between two runs.
+
+    Arguments:
+        old: dictionary
+            results of the earlier run
+        new: dictionary
+            results of the later run
+
+    Returns:
+        None, but prints a line for every phase measured by both runs
+    """
+
+    if old.get("samples") != new["samples"] \
+        or old.get("version") != new["version"]:
+        print("Warning: the runs played different numbers of games or were",
+            "measured differently, so not every phase can be compared.")
+    before = {entry["size"]: entry["phases"] for entry in old["sizes"]}
+    for entry in new["sizes"]:
+        for name, seconds in entry["phases"].items():
+            if name in before.get(entry["size"], {}):
+                print("{:>6} {:<18} {:>10.6f}s {:>10.6f}s {:>7.2f}x".format(
+                    entry["size"], name, before[entry["size"]][name],
+                    seconds, before[entry["size"]][name] / max(seconds, 1e-9)))
+    return
+
+
+def main():
+    """
+    Benchmarks every phase of the solver based on input data.
+
+    Arguments:
+        None, but reads the data of valid words from a specified file
+
+    Returns:
+        None, but writes the time each phase took
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Times each phase of the Wordle solver over sets of "
+        "words of several sizes, writing the results as JSON.")
+    parser.add_argument("infilename", help="file of all possible words")
+    parser.add_argument("--sizes", default="1000,2309,5000,12966",
+        help="comma separated numbers of words to measure with")
+    parser.add_argument("--samples", type=int, default=200,
+        help="number of secret words to play against at each size")
+    parser.add_argument("--repeat", type=int, default=3,
+        help="number of times to run each phase, keeping the fastest")
+    parser.add_argument("--output", metavar="OUTFILENAME",
+        help="file to write results to, standard out if not given")
+    parser.add_argument("--compare", metavar="OLDFILENAME",
+        help="results of an earlier run to print the speedup over")
+    args = parser.parse_args()
+
+    # check that the specified file exists
+    if not os.path.exists(args.infilename):
+        print("Error: input file specified does not exist.",
+            "Proper Usage: python3 wordle_benchmark.py <filename>",
+            file=sys.stderr)
+        return
+    try:
+        sizes = [int(size) for size in args.sizes.split(",")]
+    except ValueError:
+        print("Error: sizes must be whole numbers.", file=sys.stderr)
+        return
+
+    results = benchmark(args.infilename, sizes, args.samples, args.repeat)
+    if args.output:
+        with open(args.output, "w") as outfile:
+            json.dump(results, outfile, indent=4)
+    else:
+        json.dump(results, sys.stdout, indent=4)
+        print()
+    if args.compare:
+        with open(args.compare) as infile:
+            compare(json.load(infile), results)
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+# Made by Isaac Joffe
+
+import sys    # to read requests from standard in
+import os    # to check that file exists
+import argparse    # for command line arguments
+import asyncio    # to serve many games at once
+import json    # to read requests and write replies
+import contextlib    # to keep progress messages out of the replies
+from collections import OrderedDict    # to forget the oldest games first
+
+from wordle_solver import WordSet, Game, STRATEGIES    # to solve games
+from opening_book import OpeningBook    # to look up opening guesses
+
+
+COLOURS = set("byg")    # colours a result may use
+
+
+class Service():
+    """
+    A class to play many games of Wordle at once, all sharing one set of
+    words for each length of word, with each game holding only what is known
+    about it.
+
+    Every request is a line of JSON holding the id of a game, along with the
+    guess that was made and the result it was given once the game has
+    started, or optionally the number of letters in the word when it starts.
+    Every reply is a line of JSON holding the same id along with the next
+    guess to make, whether the game was solved, or what went wrong.
+
+    Attributes:
+        words: WordSet
+            the set of all valid words, shared by every game
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        book: dictionary
+            holds the guess to make after each history of guesses
+        load: function
+            given a number of letters, gives the set of all valid words of
+            that length along with its opening book, or None if games may
+            only use the words given
+        lengths: dictionary
+            holds the set of words and opening book of each length loaded so
+            far, each loaded only once, or None for lengths without words
+        loading: dictionary
+            holds the future of each length being loaded by serve, so
+            requests for the same length wait for a single load
+        games: OrderedDictionary
+            holds the state and last suggested guess of each game in play,
+            least recently used first
+        limit: integer
+            the most games to keep in play at once
+
+    Methods:
+        respond(request):
+            gives the reply to a single request
+        prepare(request):
+            loads the words a new game needs without holding up other games
+        serve(reader, write):
+            answers every request read from a stream
+    """
+
+    def __init__(self, words, strategy=STRATEGIES[0], book=None,
+        limit=100000, load=None):
+        """
+        Sets up a service with no games in play.
+
+        Arguments:
+            words: WordSet
+                the set of all valid words
+            strategy: string
+                how to choose the next guess, one of STRATEGIES
+            book: dictionary
+                holds the guess to make after each history of guesses
+            limit: integer
+                the most games to keep in play at once
+            load: function
+                given a number of letters, gives the set of all valid words
+                of that length along with its opening book, or None if games
+                may only use the words given
+
+        Returns:
+            None, but sets up the service
+        """
+
+        self.words = words
+        self.strategy = strategy
+        self.book = book
+        self.load = load
+        self.lengths = {words.length: (words, book)}
+        self.loading = {}
+        self.games = OrderedDict()
+        self.limit = limit
+        return
+
+    def respond(self, request):
+        """
+        Gives the reply to a single request, starting, continuing or ending
+        the game it is for.
+
+        Arguments:
+            request: dictionary
+                holds the id of the game, and the guess made and its result
+                unless the game is new, when it may hold the length of the
+                word instead
+
+        Returns:
+            reply: dictionary
+                holds the id of the game and either the next guess, whether
+                it was solved or an error
+        """
+
+        if not isinstance(request, dict) or "game" not in request:
+            return {"error": "request has no game"}
+        name = request["game"]
+        if not isinstance(name, (str, int)):
+            return {"error": "game must be a string or an integer"}
+        result = request.get("feedback")
+
+        if result is None:
+            # a request without a result starts the game over
+            length = request.get("length", self.words.length)
+            if not isinstance(length, int) or isinstance(length, bool):
+                return {"game": name, "error": "length must be an integer"}
+            if length not in self.lengths:
+                if self.load is None or length < 1:
+                    return {"game": name, "error": "no words of that length"}
+                try:
+                    self.lengths[length] = self.load(length)
+                except ValueError:
+                    self.lengths[length] = None    # never tried again
+                except OSError:
+                    # the files may be readable again later
+                    return {"game": name, "error": "words could not be read"}
+            if self.lengths[length] is None:
+                return {"game": name, "error": "no words of that length"}
+            words, book = self.lengths[length]
+            game = Game(words, self.strategy, book)
+        elif name not in self.games:
+            return {"game": name, "error": "game is not in play"}
+        else:
+            game, suggested = self.games[name]
+            guess = request.get("guess", suggested)
+            if not isinstance(guess, str) or not isinstance(result, str) \
+                or len(guess) != len(result) \
+                or len(guess) != game.words.length \
+                or not set(guess) <= set(game.words.alphabet) \
+                or not set(result) <= COLOURS:
+                return {"game": name, "error": "guess or feedback is invalid"}
+            if result == "g" * len(result):
+                del self.games[name]    # code cracked, game is over
+                return {"game": name, "solved": True}
+            # the word actually played is never guessed again, whether or
+            # not it was the one suggested
+            game.replay([(guess, result)])
+
+        if not game.count():
+            self.games.pop(name, None)
+            return {"game": name, "error": "no words are left"}
+        # suggested on a copy, so the client may play a different word
+        # without the suggestion being ruled out
+        guess = game.copy().next_guess()
+        self.games[name] = (game, guess)
+        self.games.move_to_end(name)
+        if len(self.games) > self.limit:
+            self.games.popitem(last=False)    # forget the oldest game
+        return {"game": name, "guess": guess}
+
+    async def prepare(self, request):
+        """
+        Loads the words a new game needs in another thread, so every other
+        game carries on while a length is read for the first time.
+
+        Arguments:
+            request: dictionary
+                the request about to be answered
+
+        Returns:
+            reply: dictionary
+                the error to give if the words could not be read, or None
+                once the words are loaded or need not be
+        """
+
+        if not isinstance(request, dict) or "game" not in request \
+            or request.get("feedback") is not None:
+            return    # only a new game may need another length
+        length = request.get("length")
+        if not isinstance(length, int) or isinstance(length, bool) \
+            or length < 1 or length in self.lengths or self.load is None:
+            return    # nothing to load, or respond gives the error
+        if length not in self.loading:
+            loop = asyncio.get_running_loop()
+            self.loading[length] = loop.run_in_executor(None, self.load,
+                length)
+        try:
+            self.lengths[length] = await self.loading[length]
+        except ValueError:
+            self.lengths[length] = None    # never tried again
+        except OSError:
+            # the files may be readable again later, so nothing is kept
+            self.loading.pop(length, None)
+            return {"game": request["game"],
+                "error": "words could not be read"}
+        self.loading.pop(length, None)
+        return
+
+    async def serve(self, reader, write):
+        """
+        Answers every request read from a stream, one line at a time, until
+        the stream ends.
+
+        Arguments:
+            reader: StreamReader
+                gives lines of requests
+            write: coroutine function
+                sends a line of reply
+
+        Returns:
+            None, but writes a reply to every request
+        """
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                break    # the other end has closed the stream
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                reply = {"error": "request is not valid JSON"}
+            else:
+                reply = await self.prepare(request) or self.respond(request)
+            await write((json.dumps(reply) + "\n").encode())
+        return
+
+
+async def serve_stdio(service):
+    """
+    Answers requests from standard in on standard out.
+
+    Arguments:
+        service: Service
+            the games in play
+
+    Returns:
+        None, but answers requests until standard in is closed
+    """
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    # replies go to the real standard out, whatever else is printed
+    output = sys.__stdout__.buffer
+
+    async def write(data):
+        output.write(data)
+        output.flush()
+        return
+
+    await service.serve(reader, write)
+    return
+
+
+async def serve_socket(service, path):
+    """
+    Answers requests from every connection to a local socket, each on its
+    own connection, all at once.
+
+    Arguments:
+        service: Service
+            the games in play, shared by every connection
+        path: string
+            the name of the socket to listen on
+
+    Returns:
+        None, but answers requests until stopped
+    """
+
+    async def connect(reader, writer):
+        async def write(data):
+            writer.write(data)
+            await writer.drain()    # slow readers hold up only themselves
+            return
+
+        try:
+            await service.serve(reader, write)
+        except ConnectionError:
+            pass    # the other end went away, its games are kept
+        finally:
+            writer.close()
+        return
+
+    server = await asyncio.start_unix_server(connect, path)
+    async with server:
+        await server.serve_forever()
+    return
+
+
+def main():
+    """
+    Serves games of Wordle based on input data.
+
+    Arguments:
+        None, but reads the data of valid words from a specified file
+
+    Returns:
+        None, but answers requests until stopped
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Suggests words to guess for many games of Wordle at "
+        "once, reading lines of JSON and writing a line of JSON for each.")
+    parser.add_argument("infilename",
+        help="text file of all possible words, or a binary index of them")
+    parser.add_argument("--socket", metavar="PATH",
+        help="listen on a local socket rather than standard in and out")
+    parser.add_argument("--strategy", choices=STRATEGIES,
+        default=STRATEGIES[0], help="how to choose the next guess")
+    parser.add_argument("--book-depth", metavar="N", type=int, default=2,
+        help="number of opening guesses to precompute and store, 0 for none")
+    parser.add_argument("--max-games", metavar="N", type=int, default=100000,
+        help="most games to keep in play, forgetting the oldest first")
+    parser.add_argument("--length", metavar="N", type=int,
+        help="number of letters in the word when a game does not say, by "
+        "default the length of most words in the file")
+    args = parser.parse_args()
+
+    # check that the specified file exists
+    infilename = args.infilename
+    if not os.path.exists(infilename):
+        print("Error: input file specified does not exist.",
+            "Proper Usage: python3 wordle_service.py <filename>",
+            "[--socket <path>]", file=sys.stderr)
+        return
+
+    def load(length):
+        # the words of each length are read only once, however many games
+        words = WordSet(infilename, length)
+        if args.strategy == "entropy":
+            words.feedback()    # rather than during the first request
+        book = OpeningBook(infilename, Game(words, args.strategy),
+            args.book_depth)
+        return words, book.guesses
+
+    # anything printed along the way must not be mistaken for a reply
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            words, book = load(args.length)
+        except (OSError, ValueError) as error:
+            print("Error: {}.".format(error))
+            return
+        service = Service(words, args.strategy, book, args.max_games, load)
+        try:
+            if args.socket:
+                asyncio.run(serve_socket(service, args.socket))
+            else:
+                asyncio.run(serve_stdio(service))
+        except KeyboardInterrupt:
+            pass    # stopping the service is not an error
+    return
+
+
+if __name__ == "__main__":
+    main()
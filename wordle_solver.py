@@ -1,162 +1,1857 @@
 # Made by Isaac Joffe
 
 import sys    # for command line arguments
-import os.path    # to check that file exists
+import os    # to check that file exists and replace files atomically
+import argparse    # for command line arguments
+import json    # to write measurements of each turn
+import time    # to time each turn when asked
+import mmap    # to map binary indexes straight into memory
+import struct    # to lay out the header of binary indexes
+import zlib    # to checksum binary indexes
+from array import array    # for compact per-word letter data
+from collections import Counter    # to count letters quickly
+from collections.abc import Sequence    # to present words as a list
+from math import log2    # to measure information in bits
+from operator import itemgetter    # to pick many results out of a row
+from functools import lru_cache    # to remember the most requested guesses
+
+# to give results of guesses
+from feedback import wordle, FeedbackMatrix
+# to hold what results have revealed
+from constraints import Constraints, ALPHABET
+# to decide when to stop probing
+from policy import load_policy, policy_filename
+from search import Search, ATTEMPTS    # to make sure games finish in time
+from opening_book import OpeningBook, history_key    # to look up openings
+from decision_tree import DecisionTree    # to play by lookup alone
+
+
+INDEX_MAGIC = b"WORDIDX\0"    # first bytes of every binary index
+INDEX_VERSION = 2    # bump whenever the layout of the index changes
+# magic, version, letters per word, number of words, letters in the
+# alphabet and checksum of everything after the header
+INDEX_HEADER = struct.Struct("<8sHHIII")
+# ways of choosing the next guess, the first of which is the default
+STRATEGIES = ("frequency", "entropy")
+GUESS_CACHE_SIZE = 65536    # most histories to remember the next guess of
+CONSTRAINT_CACHE_SIZE = 65536    # most constraints to remember the words of
+PRIOR_SIZE = 100    # most possible words to work out expected attempts over
+MISSING_PRIOR = 0.01    # share of the least prior given to unlisted words
+
+# every set of words and opening book loaded so far, each loaded only once
+word_lists = {}
+opening_books = {}
+default_lengths = {}    # length of most words in each file loaded so far
+# data each worker process loads once and reuses for every task it is given
+worker_data = {}
+
+
+class WordRecord():
+    """
+    A class to hold the data on a single word, readable the same way as the
+    dictionaries that used to make up the set of words.
+
+    Attributes:
+        word: string
+            the word itself
+        letters: dictionary
+            holds the number of times each letter occurs in the word
+        value: integer
+            how useful the word is to guess
+        index: integer
+            the bit of the word in sets of words
+    """
+
+    __slots__ = ("word", "letters", "value", "index")
+
+    def __init__(self, word, letters, value, index):
+        self.word = word
+        self.letters = letters
+        self.value = value
+        self.index = index
+        return
+
+    def __getitem__(self, key):
+        # allows record["word"] so older code keeps working
+        return getattr(self, key)
+
+
+class WordList(Sequence):
+    """
+    A class to present the words of a WordSet as a list of records, which
+    are only created when they are read.
+
+    Attributes:
+        words: WordSet
+            the set of words being presented
+    """
+
+    def __init__(self, words):
+        self.words = words
+        return
+
+    def __len__(self):
+        return len(self.words.words)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[number] \
+                for number in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        words = self.words
+        size = len(words.alphabet)
+        letters = {}
+        for letter in range(size):
+            if words.counts[index * size + letter]:
+                letters[words.alphabet[letter]] = \
+                    words.counts[index * size + letter]
+        return WordRecord(words.words[index], letters, words.values[index],
+            index)
 
 
 class WordSet():
     """
-    A class to hold the set of all valid Wordle words.
+    A class to hold the set of all valid Wordle words.
+
+    Attributes:
+        words: list of strings
+            contains all valid Wordle words, most valuable first
+        length: integer
+            number of letters in each word
+        alphabet: string
+            every letter the words may be made of, a to z followed by any
+            other letter the words use, in the order they are coded
+        codes: list of arrays of integers
+            the letter in each position of each word, coded by its place in
+            the alphabet, with one array per position
+        distinct: list of arrays of integers
+            the same as codes, but with any letter already seen earlier in
+            the word coded as the size of the alphabet so it is not counted
+            twice
+        counts: array of integers
+            the number of times each letter occurs in each word, one count
+            per letter of the alphabet per word
+        masks: array of integers
+            the set of letters in each word, one bit per letter of the
+            alphabet
+        values: array of integers
+            how useful each word is to guess
+        position_bits: list of lists of integers
+            the set of words with each letter in each position, one bit per
+            word
+        letter_bits: list of integers
+            the set of words containing each letter, one bit per word
+        full: integer
+            the set of every word, one bit per word
+        frequencies: list of numbers
+            the number of words containing each letter, indexed by its code,
+            or their total prior if the words have one
+        priors: array of floats
+            how likely each word is to be correct, as read from the prior
+            file stored next to the words, or None if every word is equally
+            likely
+        mass: float
+            the total prior of every word, or None if there is no prior
+        matrix: FeedbackMatrix
+            the result of every word guessed against every word, loaded only
+            once it is first needed
+        multiples: list of lists of integers
+            the set of words containing each letter at least each number of
+            times, built only once it is first needed
+        filtered: dictionary
+            holds the set of words agreeing with each of the most recent
+            constraints
+        choices: dictionary
+            holds the guess each strategy, way of choosing and policy chose
+            under each of the most recent constraints, shared by every game
+        positions: dictionary
+            holds the index of each word, built only once it is first needed
+        filename: string
+            name of the file the words were read from, next to which their
+            policies are stored
+        policies: dictionary
+            holds the policy of each strategy and mode, read only once it is
+            first needed
+        wordset: WordList
+            the same data presented as a list of records
+
+    Methods:
+        get_base_words(filename, length):
+            reads a text file containing all valid words separated by spaces
+        count_letters():
+            counts the number of letters that occur in each word
+        count_frequencies(candidates):
+            determines the number of times each letter occurs in the dataset
+        set_values(frequencies):
+            calculates the value of a word based on how common its letters are
+        get_values(frequencies):
+            gives the value of each word without changing the dataset
+        get_scores(weights):
+            gives the value of each word from a list of letter weights
+        sort_by_value():
+            sorts the list of words based on their value
+        index_words():
+            builds the bitsets used to filter words by a result
+        at_least(letter, number):
+            gives the set of words containing a letter enough times
+        filter_words(constraints):
+            gives the set of words agreeing with everything known
+        index_of(word):
+            gives the index of a word in the dataset
+        policy_for(strategy, hard):
+            gives when games played one way stop probing
+        read_priors(filename):
+            reads how likely each word is to be correct
+        weigh(indices):
+            gives the total prior of each letter over some words
+        feedback():
+            gives the result of every word guessed against every word
+        get_entropies(candidates):
+            gives how much information guessing each word would reveal
+        write_index(filename):
+            stores all word data in a binary index
+        read_index(filename):
+            maps a binary index into memory instead of computing the data
+    """
+
+    def __init__(self, filename, length=None):
+        """
+        Fully creates and serializes all data based on an input file.
+
+        Arguments:
+            filename: string
+                name of the text file to read words from, or of a binary
+                index written by write_index
+            length: integer
+                number of letters in the words to keep, by default the
+                length of most words in the file
+
+        Returns:
+            None, but creates a serialized version of the word data
+        """
+
+        self.words = []
+        self.wordset = WordList(self)
+        self.matrix = None
+        self.positions = None
+        self.multiples = None
+        self.filtered = {}
+        self.choices = {}
+        if is_index(filename):
+            self.read_index(filename)    # everything is already computed
+            if length is not None and length != self.length:
+                raise ValueError("{} only holds words of {} letters".format(
+                    filename, self.length))
+        else:
+            # execute steps to build the serilaized data
+            self.get_base_words(filename, length)
+            self.count_letters()
+            frequencies = self.count_frequencies()
+            self.set_values(frequencies)
+            self.sort_by_value()
+            self.index_words()
+        self.priors = self.read_priors(filename + ".prior")
+        self.mass = None if self.priors is None else sum(self.priors)
+        # games start from these counts and only subtract the words they drop
+        if self.priors is None:
+            self.frequencies = [count_bits(bits) for bits in self.letter_bits]
+        else:
+            self.frequencies = self.weigh(range(len(self.words)))
+        self.filename = filename
+        self.policies = {}
+        return
+
+    def get_base_words(self, filename, length=None):
+        """
+        Reads in all possible words of one length into memory, so a file of
+        words of many lengths can be split into one set of words per length.
+
+        Arguments:
+            filename: string
+                name of the text file to read words from
+            length: integer
+                number of letters in the words to keep, by default the
+                length of most words in the file
+
+        Returns:
+            None, but creates a basic skeleton of the data structure
+        """
+
+        with open(filename) as infile:
+            self.words = infile.read().split()    # separated by spaces
+        if length is None:
+            lengths = Counter(map(len, self.words))
+            # the shortest of the most common lengths wins any ties
+            length = min(lengths, default=0,
+                key=lambda length: (-lengths[length], length))
+        self.words = [word for word in self.words if len(word) == length]
+        if not self.words:
+            raise ValueError("{} has no words of {} letters".format(filename,
+                length))
+        self.length = length
+        # letters outside a to z are coded after them, in order
+        extra = sorted(set("".join(self.words)) - set(ALPHABET))
+        self.alphabet = ALPHABET + "".join(extra)
+        if len(self.alphabet) > 64:
+            raise ValueError("{} uses more than 64 different letters".format(
+                filename))
+        return
+
+    def count_letters(self):
+        """
+        Counts which letters occur in each word and how often the occur.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        size = len(self.words)
+        letters = len(self.alphabet)
+        coding = {letter: code for code, letter in enumerate(self.alphabet)}
+        self.codes = [array("B", bytes(size)) for number in range(self.length)]
+        self.distinct = [array("B", bytes(size)) \
+            for number in range(self.length)]
+        self.counts = array("B", bytes(size * letters))
+        self.masks = array("Q", bytes(size * array("Q").itemsize))
+        for index, word in enumerate(self.words):
+            # count each letter in each word and store in the words row
+            mask = 0
+            for number, letter in enumerate(word):
+                code = coding[letter]
+                self.codes[number][index] = code
+                self.counts[index * letters + code] += 1
+                # double letters are not counted again
+                self.distinct[number][index] = letters \
+                    if mask >> code & 1 else code
+                mask |= 1 << code
+            self.masks[index] = mask
+        return
+
+    def count_frequencies(self, candidates=None):
+        """
+        Counts how often each letter occurs in the entire dataset.
+
+        Arguments:
+            candidates: integer
+                if given, only the words in this set of bits are counted
+
+        Returns:
+            frequencies: dictionary
+                holds the number of times each letter occurs in the dataset
+        """
+
+        frequencies = {}    # dictionary of each letters count
+        for letter in self.alphabet:
+            frequencies[letter] = 0
+        if candidates is not None:
+            # count the words in the set that share each letter all at once
+            for code, letter in enumerate(self.alphabet):
+                frequencies[letter] = \
+                    count_bits(candidates & self.letter_bits[code])
+            return frequencies
+        totals = Counter()
+        for column in self.distinct:
+            # count every letter in every word to keep track fo frequency
+            totals.update(column)
+        for code, letter in enumerate(self.alphabet):
+            frequencies[letter] = totals[code]
+
+        """
+        # optional normalization of data
+        total = len(self.wordset) * 5
+        for letter in self.frequencies.keys():
+            self.frequencies[letter] /= total
+        """
+        return frequencies
+
+    def set_values(self, frequencies):
+        """
+        Sets the value of each word in terms of how often its letters occur.
+
+        Arguments:
+            frequencies: dictionary
+                holds the number of times each letter occurs in the dataset
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        self.values = array("l", self.get_values(frequencies))
+        return
+
+    def get_values(self, frequencies):
+        """
+        Gives the value of each word in terms of how often its letters occur,
+        without changing the dataset so it can be shared between games.
+
+        Arguments:
+            frequencies: dictionary
+                holds the number of times each letter occurs in the dataset
+
+        Returns:
+            values: list of integers
+                the value of each word, in the order of the dataset
+        """
+
+        weights = [frequencies[letter] for letter in self.alphabet]
+        return self.get_scores(weights)
+
+    def get_scores(self, weights):
+        """
+        Gives the value of each word as the total weight of its distinct
+        letters, multiplying every word by the weights at once.
+
+        Arguments:
+            weights: list of integers
+                the weight of each letter, indexed by its code
+
+        Returns:
+            values: list of integers
+                the value of each word, in the order of the dataset
+        """
+
+        weights = list(weights[:len(self.alphabet)])
+        weights.append(0)    # letters seen earlier in the word are worthless
+        # compute value of each word based on how useful each distinct
+        # letter inside it, adding up one position of every word at a time
+        return list(map(sum, zip(*[map(weights.__getitem__, column) \
+            for column in self.distinct])))
+
+    def sort_by_value(self):
+        """
+        Sorts the entire dataset based on how valuable each word is.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        # sort dataset in descending order for easy access to first element,
+        # moving every array of data on the words along with the words
+        order = sorted(range(len(self.words)), reverse=True,
+            key=self.values.__getitem__)
+        self.words = [self.words[index] for index in order]
+        self.values = array("l", map(self.values.__getitem__, order))
+        self.masks = array("Q", map(self.masks.__getitem__, order))
+        self.codes = [array("B", map(column.__getitem__, order)) \
+            for column in self.codes]
+        self.distinct = [array("B", map(column.__getitem__, order)) \
+            for column in self.distinct]
+        letters = len(self.alphabet)
+        counts = array("B")
+        for index in order:
+            counts.extend(self.counts[index * letters:(index + 1) * letters])
+        self.counts = counts
+        return
+
+    def index_words(self):
+        """
+        Builds the sets of words sharing each letter, so a result can be
+        applied to every word at once.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        size = len(self.words)
+        letters = len(self.alphabet)
+        # list which words belong in each set before turning them into bits
+        positions = [[[] for letter in range(letters)] \
+            for number in range(self.length)]
+        present = [[] for letter in range(letters)]
+        for number, column in enumerate(self.codes):
+            for index, code in enumerate(column):
+                positions[number][code].append(index)
+        for column in self.distinct:
+            for index, code in enumerate(column):
+                if code < letters:
+                    present[code].append(index)
+
+        self.position_bits = [[indices_to_bits(indices, size) \
+            for indices in letters] for letters in positions]
+        self.letter_bits = [indices_to_bits(indices, size) \
+            for indices in present]
+        self.full = (1 << size) - 1
+        return
+
+    def at_least(self, letter, number):
+        """
+        Gives the set of words containing a letter at least a number of
+        times, building the sets for repeated letters once first needed.
+
+        Arguments:
+            letter: integer
+                the code of the letter
+            number: integer
+                the fewest times the letter must occur
+
+        Returns:
+            bits: integer
+                the set of words, one bit per word
+        """
+
+        if number <= 0:
+            return self.full
+        if number == 1:
+            return self.letter_bits[letter]
+        if self.multiples is None:
+            letters = len(self.alphabet)
+            # list which words repeat each letter before turning them to bits
+            repeated = [[[] for number in range(self.length + 1)] \
+                for letter in range(letters)]
+            for index in range(len(self.words)):
+                row = self.counts[index * letters:(index + 1) * letters]
+                for code in range(letters):
+                    for times in range(2, row[code] + 1):
+                        repeated[code][times].append(index)
+            self.multiples = [[indices_to_bits(indices, len(self.words)) \
+                for indices in lists] for lists in repeated]
+        if number > self.length:
+            return 0
+        return self.multiples[letter][number]
+
+    def filter_words(self, constraints):
+        """
+        Gives the set of words that agree with everything known about the
+        secret word, remembering the sets of the most recent constraints.
+
+        Arguments:
+            constraints: Constraints
+                everything the results so far have revealed
+
+        Returns:
+            candidates: integer
+                the set of words that are possibly correct, one bit per word
+        """
+
+        if constraints in self.filtered:
+            return self.filtered[constraints]
+        candidates = self.full
+        letters = len(self.alphabet)
+        every = (1 << letters) - 1
+        for number, mask in enumerate(constraints.allowed):
+            if mask == every:
+                continue
+            if not mask & (mask - 1):
+                # a single letter is allowed, so it is known to be there
+                candidates &= self.position_bits[number][mask.bit_length() - 1]
+                continue
+            for letter in range(letters):
+                if not mask >> letter & 1:
+                    candidates &= ~self.position_bits[number][letter]
+        for letter in range(letters):
+            if constraints.minimum[letter]:
+                candidates &= self.at_least(letter,
+                    constraints.minimum[letter])
+            if constraints.maximum[letter] < self.length:
+                candidates &= ~self.at_least(letter,
+                    constraints.maximum[letter] + 1)
+        if len(self.filtered) >= CONSTRAINT_CACHE_SIZE:
+            self.filtered.clear()    # old constraints are rarely met again
+        self.filtered[constraints] = candidates
+        return candidates
+
+    def index_of(self, word):
+        """
+        Gives the index of a word in the dataset, which is also its bit in
+        sets of words.
+
+        Arguments:
+            word: string
+                the word to find
+
+        Returns:
+            index: integer
+                where the word is in the dataset, or None if it is not
+        """
+
+        if self.positions is None:
+            self.positions = {word: index for index, word \
+                in enumerate(self.words)}
+        return self.positions.get(word)
+
+    def policy_for(self, strategy, hard=False):
+        """
+        Gives the policy deciding when games played one way stop probing, as
+        tuned for these words and stored next to them, or the default if
+        none has been tuned.
+
+        Arguments:
+            strategy: string
+                how the next guess is chosen, one of STRATEGIES
+            hard: boolean
+                whether every guess must use all the hints revealed so far
+
+        Returns:
+            policy: ThresholdPolicy
+                decides when to stop probing
+        """
+
+        key = (strategy, bool(hard))
+        if key not in self.policies:
+            self.policies[key] = load_policy(policy_filename(self.filename,
+                self.length, strategy, hard))
+        return self.policies[key]
+
+    def read_priors(self, filename):
+        """
+        Reads how likely each word is to be correct from a text file holding
+        a word and its weight on each line, such as how often it is used.
+        A word alone on a line has a weight of one, and words not in the file
+        get a hundredth of the least weight given, so they are still guessed
+        but only once likelier words are ruled out.
+
+        Arguments:
+            filename: string
+                name of the file the prior is stored in
+
+        Returns:
+            priors: array of floats
+                the weight of each word, in the order of the dataset, or None
+                if there is no file
+        """
+
+        if not os.path.exists(filename):
+            return None
+        weights = {}
+        with open(filename) as infile:
+            for line in infile:
+                fields = line.split()
+                if not fields:
+                    continue
+                try:
+                    weight = float(fields[1]) if len(fields) > 1 else 1.0
+                except ValueError:
+                    weight = -1.0
+                if len(fields) > 2 or not weight >= 0:
+                    raise ValueError("{} is not a valid prior file".format(
+                        filename))
+                weights[fields[0]] = weight
+        given = [weight for weight in weights.values() if weight > 0]
+        missing = min(given, default=1.0) * MISSING_PRIOR
+        return array("f", (weights.get(word, missing) for word in self.words))
+
+    def weigh(self, indices):
+        """
+        Gives the total prior of the words containing each letter, over some
+        of the words.
+
+        Arguments:
+            indices: iterable of integers
+                the indices of the words to add up
+
+        Returns:
+            weights: list of floats
+                the total prior of the words containing each letter, indexed
+                by its code
+        """
+
+        weights = [0.0] * (len(self.alphabet) + 1)    # last for repeats
+        for index in indices:
+            prior = self.priors[index]
+            for column in self.distinct:
+                weights[column[index]] += prior
+        weights.pop()
+        return weights
+
+    def feedback(self):
+        """
+        Gives the result of every word guessed against every word, which is
+        computed once and then cached on disk.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            matrix: FeedbackMatrix
+                the result of every guess, with words in dataset order
+        """
+
+        if self.matrix is None:
+            self.matrix = FeedbackMatrix(self.words, self.words)
+        return self.matrix
+
+    def get_entropies(self, candidates, guesses=None):
+        """
+        Gives how much information guessing each word would reveal, being the
+        entropy of how the guess splits up the words that may be correct.
+
+        Arguments:
+            candidates: integer
+                the set of words that are still possibly correct
+            guesses: integer
+                if given, only the words in this set of bits are measured
+
+        Returns:
+            entropies: list of floats
+                the expected number of bits revealed by guessing each word,
+                or -1 for words that were not measured
+        """
+
+        size = len(self.words)
+        indices = bits_to_indices(candidates)
+        total = len(indices)
+        if total < 2:
+            return [0.0] * size    # nothing is left to learn
+        rows = range(size) if guesses is None else bits_to_indices(guesses)
+        # plogp[count] is how much a group of that many words adds up to
+        plogp = [0.0] + [count * log2(count) for count in range(1, total + 1)]
+        pick = None if total == size else itemgetter(*indices)
+        view = self.feedback().codes
+        entropies = [-1.0] * size
+        for index in rows:
+            # count how many possible words give each result for this guess
+            row = view[index * size:(index + 1) * size]
+            groups = Counter(row if pick is None else pick(row))
+            entropies[index] = log2(total) - sum(map(plogp.__getitem__,
+                groups.values())) / total
+        return entropies
+
+    def write_index(self, filename):
+        """
+        Stores all word data in a binary index that can be read back with a
+        single memory map.
+
+        Arguments:
+            filename: string
+                name of the index file to write to
+
+        Returns:
+            None, but creates a file containing the index
+        """
+
+        size = len(self.words)
+        if any(len(word) != self.length for word in self.words):
+            raise ValueError("all words in an index must have the same length")
+        width = (size + 7) // 8    # bytes in each set of words
+        # sections are written in the order given by index_sections
+        sections = [
+            "".join(self.words).encode("utf-32-le"),
+            self.alphabet.encode("utf-32-le"),
+            b"".join(bytes(column) for column in self.codes),
+            b"".join(bytes(column) for column in self.distinct),
+            bytes(self.counts),
+            little_endian(array("Q", self.masks)),
+            little_endian(array("i", self.values)),
+            b"".join(bits.to_bytes(width, "little") \
+                for bits in self.letter_bits),
+            b"".join(bits.to_bytes(width, "little") \
+                for letters in self.position_bits for bits in letters),
+        ]
+        payload = b"".join(section + bytes(-len(section) % 8) \
+            for section in sections)
+        header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.length,
+            size, len(self.alphabet), zlib.crc32(payload))
+
+        # write to a temporary file first so a crash never leaves half an index
+        partial = filename + ".partial"
+        with open(partial, "wb") as outfile:
+            outfile.write(header)
+            outfile.write(payload)
+        os.replace(partial, filename)
+        return
+
+    def read_index(self, filename):
+        """
+        Maps a binary index written by write_index into memory, so none of
+        the word data has to be computed again.
+
+        Arguments:
+            filename: string
+                name of the index file to read from
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        with open(filename, "rb") as infile:
+            data = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(data) < INDEX_HEADER.size:
+            raise ValueError("{} is not a word index".format(filename))
+        magic, version, length, size, letters, checksum = \
+            INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC:
+            raise ValueError("{} is not a word index".format(filename))
+        if version != INDEX_VERSION:
+            raise ValueError("{} is an unsupported word index version".format(
+                filename))
+        view = memoryview(data)[INDEX_HEADER.size:]
+        if len(view) != sum(index_sections(length, size, letters)) \
+            or zlib.crc32(view) != checksum:
+            raise ValueError("{} is a corrupted word index".format(filename))
+
+        # cut the mapped file into its sections without copying any of them
+        sections = []
+        for section in index_sections(length, size, letters):
+            sections.append(view[:section])
+            view = view[section:]
+        words, alphabet, codes, distinct, counts, masks, values, \
+            letter_bits, position_bits = sections
+        width = (size + 7) // 8
+
+        self.length = length
+        text = bytes(words[:size * length * 4]).decode("utf-32-le")
+        self.words = [text[index * length:(index + 1) * length] \
+            for index in range(size)]
+        self.alphabet = bytes(alphabet[:letters * 4]).decode("utf-32-le")
+        self.codes = [codes[number * size:(number + 1) * size] \
+            for number in range(length)]
+        self.distinct = [distinct[number * size:(number + 1) * size] \
+            for number in range(length)]
+        self.counts = counts[:size * letters]
+        self.masks = native_array(masks[:size * 8], "Q")
+        self.values = native_array(values[:size * 4], "i")
+        self.letter_bits = [int.from_bytes(
+            letter_bits[letter * width:(letter + 1) * width], "little") \
+            for letter in range(letters)]
+        self.position_bits = [[int.from_bytes(position_bits[(number * letters
+            + letter) * width:(number * letters + letter + 1) * width],
+            "little") for letter in range(letters)] \
+            for number in range(length)]
+        self.full = (1 << size) - 1
+        return
+
+
+class Game():
+    """
+    A class to hold what is known about a single game, while the words
+    themselves are shared by every game and never changed.
+
+    Attributes:
+        words: WordSet
+            the set of all valid words
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        book: dictionary
+            holds the guess to make after each history of guesses, or None if
+            no opening book is used
+        history: list of tuples of strings
+            every guess made so far along with its result
+        candidates: integer
+            the set of words that are still possibly correct, one bit per word
+        constraints: Constraints
+            everything the results so far have revealed about the word
+        pool: integer
+            the set of words hard mode still allows to be guessed, one bit per
+            word, or None if any word may be guessed
+        frequencies: list of numbers
+            the number of possibly correct words containing each letter, or
+            their total prior if the words have one, or None while every
+            word is still possibly correct
+        mass: float
+            the total prior of the words that are still possibly correct, or
+            None if the words have no prior
+        policy: ThresholdPolicy
+            decides when to stop probing with the most valuable word
+        search: Search
+            makes sure every possible word is solved within the guesses left
+            once few are left, or None if guesses are never checked
+        metrics: function
+            given a dictionary measuring each guess and each update, or None
+            if nothing is measured
+        timings: dictionary
+            the measurements of the step being taken, or None if nothing is
+            being measured
+
+    Methods:
+        count():
+            gives the number of words that are still possibly correct
+        next_guess():
+            chooses the next word to guess
+        start(event, **fields):
+            starts measuring a step
+        lap(name):
+            notes the time taken by part of a step
+        finish(**fields):
+            stops measuring a step and passes on its measurements
+        choose(chooser):
+            chooses a word, sharing the choice with games that know the same
+        most_valuable():
+            chooses the word whose letters are most common
+        most_informative():
+            chooses the word whose result reveals the most, on average
+        fewest_attempts():
+            chooses the possible word expected to take the fewest attempts
+        update(guess, result):
+            narrows down the possible words using the result of a guess
+        replay(history):
+            brings a new game up to date with guesses made elsewhere
+        discard(index):
+            makes sure a word is never guessed again
+        remove(removed):
+            removes words from those that are possibly correct
+        copy():
+            makes an independent copy of the game
+    """
+
+    def __init__(self, words, strategy=STRATEGIES[0], book=None, hard=False,
+        metrics=None, policy=None, search=None):
+        """
+        Starts a new game, in which every word is possibly correct.
+
+        Arguments:
+            words: WordSet
+                the set of all valid words
+            strategy: string
+                how to choose the next guess, one of STRATEGIES
+            book: dictionary
+                holds the guess to make after each history of guesses
+            hard: boolean
+                whether every guess must use all the hints revealed so far
+            metrics: function
+                given a dictionary measuring each guess and each update
+            policy: ThresholdPolicy
+                decides when to stop probing, the one stored with the words
+                for this strategy and mode if not given
+            search: Search
+                makes sure every possible word is solved within the guesses
+                left, shared by every game so solutions are only found once
+
+        Returns:
+            None, but sets up the state of the game
+        """
+
+        self.words = words
+        self.strategy = strategy
+        self.book = book
+        self.history = []
+        self.candidates = words.full
+        self.constraints = Constraints(words.length, alphabet=words.alphabet)
+        self.pool = words.full if hard else None
+        self.frequencies = None    # copied only once it first differs
+        self.mass = words.mass
+        self.policy = policy if policy is not None \
+            else words.policy_for(strategy, hard)
+        self.search = search
+        self.metrics = metrics
+        self.timings = None
+        return
+
+    def count(self):
+        """
+        Gives the number of words that are still possibly correct.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            count: integer
+                the number of words that are still possibly correct
+        """
+
+        return count_bits(self.candidates)
+
+    def next_guess(self):
+        """
+        Chooses the next word to guess.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            test_word: string
+                the word to guess next
+        """
+
+        if self.metrics is not None:
+            self.start("guess", candidates=self.count())
+        guess = None
+        if self.book is not None:
+            # openings are looked up instead of worked out whenever possible
+            guess = self.book.get(history_key(self.history))
+        if guess is not None:
+            branch = "book"
+            index = self.words.index_of(guess)
+        elif self.strategy == "entropy":
+            branch = "entropy"
+            index = self.choose(self.most_informative)
+        # guess valuable words until set is narrowed down enough
+        elif self.policy.probe(self):
+            branch = "probe"
+            index = self.choose(self.most_valuable)
+        # guess a word that may be correct
+        elif self.words.priors is not None:
+            branch = "pick"
+            index = self.choose(self.fewest_attempts)
+        else:
+            branch = "pick"
+            # the lowest bit is the most valuable word that may be correct
+            index = (self.candidates & -self.candidates).bit_length() - 1
+        if self.search is not None and self.count() <= self.search.size:
+            # swap the guess for one sure to finish in time, if it is not
+            chosen = index
+            index = self.search.guess(bits_to_indices(self.candidates),
+                ATTEMPTS - len(self.history), index, self.pool is not None)
+            if index != chosen:
+                branch = "search"
+            if self.timings is not None:
+                self.lap("search")
+        self.discard(index)
+        if self.timings is not None:
+            self.finish(branch=branch, guess=self.words.words[index])
+        return self.words.words[index]
+
+    def start(self, event, **fields):
+        """
+        Starts measuring a step of the game.
+
+        Arguments:
+            event: string
+                "guess" or "update", the step being measured
+            fields: dictionary
+                anything else to note about the step
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        self.timings = {"event": event, "turn": len(self.history) + 1}
+        self.timings.update(fields)
+        self.timings["started"] = self.timings["lapped"] = time.perf_counter()
+        return
+
+    def lap(self, name):
+        """
+        Notes the time taken by part of the step being measured, since the
+        step started or the last part ended.
+
+        Arguments:
+            name: string
+                what the part of the step was doing
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        now = time.perf_counter()
+        key = name + "_seconds"
+        self.timings[key] = self.timings.get(key, 0.0) \
+            + now - self.timings["lapped"]
+        self.timings["lapped"] = now
+        return
+
+    def finish(self, **fields):
+        """
+        Stops measuring a step and passes its measurements on.
+
+        Arguments:
+            fields: dictionary
+                anything else to note about the step
+
+        Returns:
+            None, but calls the metrics function
+        """
+
+        timings = self.timings
+        self.timings = None
+        timings["seconds"] = time.perf_counter() - timings.pop("started")
+        del timings["lapped"]
+        timings.update(fields)
+        self.metrics(timings)
+        return
+
+    def choose(self, chooser):
+        """
+        Chooses a word, reusing the choice of any game that knew exactly the
+        same things, whatever guesses it made to learn them.
+
+        Arguments:
+            chooser: function
+                works out the index of the word to guess next
+
+        Returns:
+            index: integer
+                the index of the word to guess next
+        """
+
+        # games only choose the same if they choose in the same way
+        key = (self.strategy, chooser.__name__,
+            tuple(sorted(self.policy.describe().items())), self.constraints,
+            self.pool)
+        choices = self.words.choices
+        # only games left with exactly the words agreeing with what they know
+        # can be sure to choose the same
+        shared = self.candidates == self.words.filter_words(self.constraints)
+        if self.timings is not None:
+            self.timings["shared"] = shared and key in choices
+        if shared and key in choices:
+            return choices[key]
+        index = chooser()
+        if shared:
+            if len(choices) >= CONSTRAINT_CACHE_SIZE:
+                choices.clear()    # games move on, so old choices go unused
+            choices[key] = index
+        return index
+
+    def most_valuable(self):
+        """
+        Chooses the word whose letters are most common among the words that
+        may be correct, and so would best narrow them down.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            index: integer
+                the index of the word to guess next
+        """
+
+        frequencies = self.frequencies or self.words.frequencies
+        # letters that are already known to appear are not useful
+        weights = [0 if self.constraints.minimum[letter] \
+            else frequencies[letter] for letter in range(len(frequencies))]
+        # the earliest word in the dataset wins any ties
+        values = self.words.get_scores(weights)
+        if self.timings is not None:
+            self.lap("score")
+        if self.pool is not None:
+            index = max(bits_to_indices(self.pool), key=values.__getitem__)
+        else:
+            index = max(range(len(values)), key=values.__getitem__)
+        if not values[index]:
+            # no letter left tells the words apart, so probing learns nothing
+            index = (self.candidates & -self.candidates).bit_length() - 1
+        if self.timings is not None:
+            self.lap("rank")
+        return index
+
+    def most_informative(self):
+        """
+        Chooses the word whose result is expected to reveal the most about
+        which words may be correct.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            index: integer
+                the index of the word to guess next
+        """
+
+        if self.count() <= 2 and self.words.priors is not None:
+            # the likelier of the words should be guessed first
+            index = self.fewest_attempts()
+        elif self.count() <= 2:
+            # guessing a possible word is at least as good as anything else
+            index = (self.candidates & -self.candidates).bit_length() - 1
+        else:
+            entropies = self.words.get_entropies(self.candidates, self.pool)
+            if self.timings is not None:
+                self.lap("score")
+            possible = set(bits_to_indices(self.candidates))
+            # between equally informative words, prefer one that may be right
+            index = max(range(len(entropies)),
+                key=lambda index: (entropies[index], index in possible))
+            if self.timings is not None:
+                self.lap("rank")
+        return index
+
+    def fewest_attempts(self):
+        """
+        Chooses the word that may be correct expected to solve the game in
+        the fewest attempts, weighing each word by its prior and supposing
+        the words left after each result are then guessed one at a time,
+        likeliest first.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            index: integer
+                the index of the word to guess next
+        """
+
+        candidates = bits_to_indices(self.candidates)
+        priors = self.words.priors
+        words = self.words.words
+        if len(candidates) > PRIOR_SIZE:
+            # too many words to work out, so guess the likeliest
+            return max(candidates, key=lambda index: (priors[index], -index))
+        index = None
+        best = None
+        for guess in candidates:
+            groups = {}
+            for answer in candidates:
+                if answer != guess:
+                    groups.setdefault(wordle(words[answer], words[guess]),
+                        []).append(priors[answer])
+            # each word takes one more attempt than the likelier words of its
+            # group, after this guess
+            cost = sum(sum(prior * (number + 2) for number, prior \
+                in enumerate(sorted(group, reverse=True))) \
+                for group in groups.values())
+            cost += priors[guess]    # guessing the word itself takes one
+            if best is None or cost < best:
+                index = guess    # the earliest word wins any ties
+                best = cost
+        if self.timings is not None:
+            self.lap("score")
+            if self.mass > 0:
+                self.timings["expected"] = best / self.mass
+        return index
+
+    def update(self, guess, result):
+        """
+        Narrows down the possible words using the result of a guess.
+
+        Arguments:
+            guess: string
+                word that was guessed
+            result: string
+                string of colours given in response to the guess
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        # checked before anything changes or is measured, so a bad result
+        # leaves the game as it was
+        constraints = self.constraints.add(guess, result)
+        if self.metrics is not None:
+            self.start("update", guess=guess, result=result,
+                before=self.count())
+        self.constraints = constraints
+        self.history.append((guess, result))
+        # remove any and all words that are not possibly correct
+        remaining = self.words.filter_words(self.constraints)
+        if self.timings is not None:
+            self.lap("filter")
+        self.remove(self.candidates & ~remaining)
+        if self.timings is not None:
+            self.lap("recount")
+        if self.pool is not None:
+            # later guesses must keep every green and use every yellow
+            found = Counter()
+            for number in range(len(result)):
+                letter = self.words.alphabet.index(guess[number])
+                if result[number] == "g":
+                    self.pool &= self.words.position_bits[number][letter]
+                if result[number] != "b":
+                    found[letter] += 1
+            for letter, times in found.items():
+                self.pool &= self.words.at_least(letter, times)
+        if self.timings is not None:
+            after = self.count()
+            self.finish(after=after, removed=self.timings["before"] - after)
+        return
+
+    def replay(self, history):
+        """
+        Brings a new game up to date with guesses made elsewhere, leaving it
+        exactly as if it had suggested each of them itself.
+
+        Arguments:
+            history: list of tuples of strings
+                every guess made so far along with its result
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        for guess, result in history:
+            index = self.words.index_of(guess)
+            if index is not None:
+                self.discard(index)
+            self.update(guess, result)
+        return
+
+    def discard(self, index):
+        """
+        Makes sure a word that has been guessed is never guessed again.
+
+        Arguments:
+            index: integer
+                the index of the word that was guessed
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        self.remove(1 << index)
+        if self.pool is not None:
+            self.pool &= ~(1 << index)
+        return
+
+    def remove(self, removed):
+        """
+        Removes words from those that are possibly correct, subtracting their
+        letters from the letter counts rather than counting every word again.
+
+        Arguments:
+            removed: integer
+                the set of words to remove, one bit per word
+
+        Returns:
+            None, but updates existing class attributes
+        """
+
+        removed &= self.candidates
+        if self.words.priors is not None:
+            # each word is only ever removed once, so this is at most one
+            # pass over the words in a whole game
+            indices = bits_to_indices(removed)
+            self.mass -= sum(map(self.words.priors.__getitem__, indices))
+            if self.strategy == "frequency":
+                if self.frequencies is None:
+                    self.frequencies = list(self.words.frequencies)
+                for letter, weight in enumerate(self.words.weigh(indices)):
+                    self.frequencies[letter] -= weight
+        elif self.strategy == "frequency":
+            if self.frequencies is None:
+                self.frequencies = list(self.words.frequencies)
+            # subtract the removed words sharing each letter all at once
+            for letter in range(len(self.frequencies)):
+                self.frequencies[letter] -= \
+                    count_bits(removed & self.words.letter_bits[letter])
+        self.candidates &= ~removed
+        return
+
+    def copy(self):
+        """
+        Makes an independent copy of the game, so different results of the
+        same guess can be followed separately.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            other: Game
+                a game in exactly the same state
+        """
+
+        other = Game(self.words, self.strategy, self.book,
+            policy=self.policy, search=self.search)
+        other.history = list(self.history)
+        other.candidates = self.candidates
+        other.pool = self.pool
+        other.constraints = self.constraints    # never changed, only replaced
+        if self.frequencies is not None:
+            other.frequencies = list(self.frequencies)
+        other.mass = self.mass
+        return other
+
+
+class MultiGame():
+    """
+    A class to play several boards at once, as in Quordle or Octordle, where
+    every guess is made on every board that is not yet solved.
 
     Attributes:
-        wordset: list of dictionaries
-            contains all valid Wordle words along with data on what letters
-            the word conatins and how useful the word is
+        words: WordSet
+            the set of all valid words, shared by every board
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        boards: list of Games
+            what is known about the secret word of each board
+        solved: list of booleans
+            whether each board has been solved
+        policy: ThresholdPolicy
+            decides when to stop probing with the most valuable word
 
     Methods:
-        get_base_words(filename):
-            reads a text file containing all valid words separated by spaces
-        count_letters():
-            counts the number of letters that occur in each word
-        count_frequencies():
-            determines the number of times each letter occurs in the dataset
-        set_values(frequencies):
-            calculates the value of a word based on how common its letters are
-        sort_by_value():
-            sorts the list of words based on their value
+        count():
+            gives the number of words still possibly correct on any board
+        unsolved():
+            gives the boards that are not yet solved
+        next_guess():
+            chooses the next word to guess on every board
+        most_valuable():
+            chooses the word whose letters are most common on every board
+        weights():
+            gives how useful each letter is, added up over every board
+        most_informative():
+            chooses the word whose result reveals the most over every board
+        update(guess, results):
+            narrows down the possible words of every board at once
     """
 
-    def __init__(self, filename):
+    def __init__(self, words, number, strategy=STRATEGIES[0], policy=None):
         """
-        Fully creates and serializes all data based on an input file.
+        Starts a new game, in which every word is possibly correct on every
+        board.
 
         Arguments:
-            filename: string
-                name of the text file to read words from
+            words: WordSet
+                the set of all valid words
+            number: integer
+                the number of boards to play at once
+            strategy: string
+                how to choose the next guess, one of STRATEGIES
+            policy: ThresholdPolicy
+                decides when to stop probing, the one stored with the words
+                for this strategy if not given
 
         Returns:
-            None, but creates a serialized version of the word data
+            None, but sets up the state of the game
         """
 
-        self.wordset = []
-
-        # execute steps to build the serilaized data
-        self.get_base_words(filename)
-        self.count_letters()
-        frequencies = self.count_frequencies()
-        self.set_values(frequencies)
-        self.sort_by_value()
+        self.words = words
+        self.strategy = strategy
+        self.boards = [Game(words, strategy, policy=policy) \
+            for board in range(number)]
+        self.solved = [False] * number
+        self.policy = self.boards[0].policy
         return
 
-    def get_base_words(self, filename):
+    def count(self):
         """
-        Reads in all possible words into memory.
+        Gives the number of words still possibly correct on any board that is
+        not yet solved.
 
         Arguments:
-            filename: string
-                name of the text file to read words from
+            None, but operates on existing class attributes
 
         Returns:
-            None, but creates a basic skeleton of the data structure
+            count: integer
+                the number of words in every set of candidates together
         """
 
-        with open(filename) as infile:
-            words = infile.read().split()    # words are separated by spaces
-        for word in words:
-            # create base attributes of each word
-            self.wordset.append({"word": word, "letters": {}, "value": 0})
-        return
+        combined = 0
+        for board in self.unsolved():
+            combined |= board.candidates
+        return count_bits(combined)
 
-    def count_letters(self):
+    def unsolved(self):
         """
-        Counts which letters occur in each word and how often the occur.
+        Gives the boards that are not yet solved.
 
         Arguments:
             None, but operates on existing class attributes
 
         Returns:
-            None, but updates existing class attributes
+            boards: list of Games
+                every board still being played, in order
         """
 
-        for element in self.wordset:
-            # count each letter in each word and store in the words dictionary
-            for letter in element["word"]:
-                if letter not in element["letters"]:
-                    element["letters"][letter] = 1
-                else:
-                    element["letters"][letter] += 1
-        return
+        return [board for board, solved in zip(self.boards, self.solved) \
+            if not solved]
 
-    def count_frequencies(self):
+    def next_guess(self):
         """
-        Counts how often each letter occurs in the entire dataset.
+        Chooses the next word to guess, the same on every board.
 
         Arguments:
             None, but operates on existing class attributes
 
         Returns:
-            frequencies: dictionary
-                holds the number of times each letter occurs in the dataset
+            test_word: string
+                the word to guess next
         """
 
-        frequencies = {}    # dictionary of each letters count
-        for letter in range(26):
-            frequencies[chr(ord("a") + letter)] = 0
-        for element in self.wordset:
-            # count every letter in every word to keep track fo frequency
-            for letter in element["letters"]:
-                frequencies[letter] += 1
+        boards = self.unsolved()
+        narrowest = min(boards, key=Game.count)
+        if not narrowest.count():
+            raise ValueError("no words agree with the results of board {}"
+                "".format(self.boards.index(narrowest) + 1))
+        if narrowest.count() == 1:
+            # a board that is known for certain is solved for free
+            index = narrowest.candidates.bit_length() - 1
+        elif self.strategy == "entropy":
+            index = self.most_informative()
+        # guess valuable words until some board is narrowed down enough
+        elif all(self.policy.probe(board) for board in boards):
+            index = self.most_valuable()
+        # guess a word that may be correct on the narrowest board, whose
+        # letters are most common on the others
+        else:
+            values = self.words.get_scores(self.weights())
+            index = max(bits_to_indices(narrowest.candidates),
+                key=lambda index: (values[index], -index))
+        for board in boards:
+            board.discard(index)
+        return self.words.words[index]
 
+    def most_valuable(self):
         """
-        # optional normalization of data
-        total = len(self.wordset) * 5
-        for letter in self.frequencies.keys():
-            self.frequencies[letter] /= total
+        Chooses the word whose letters are most common among the words that
+        may be correct, adding up the weight of each letter over every board.
+
+        Arguments:
+            None, but operates on existing class attributes
+
+        Returns:
+            index: integer
+                the index of the word to guess next
         """
-        return frequencies
 
-    def set_values(self, frequencies):
+        # the earliest word in the dataset wins any ties
+        values = self.words.get_scores(self.weights())
+        index = max(range(len(values)), key=values.__getitem__)
+        if not values[index]:
+            # no letter left tells any words apart, so guess a possible one
+            narrowest = min(self.unsolved(), key=Game.count)
+            index = (narrowest.candidates & -narrowest.candidates) \
+                .bit_length() - 1
+        return index
+
+    def weights(self):
         """
-        Sets the value of each word in terms of how often its letters occur.
+        Gives how useful each letter is to guess, being the number of words
+        containing it that may be correct, added up over every board.
 
         Arguments:
-            frequencies: dictionary
-                holds the number of times each letter occurs in the dataset
+            None, but operates on existing class attributes
 
         Returns:
-            None, but updates existing class attributes
+            weights: list of integers
+                the weight of each letter, indexed by its code
         """
 
-        for element in self.wordset:
-            element["value"] = 0
-            # compute value of each word based on how useful each distinct
-            # letter inside it, double letters are not counted again
-            for letter in element["letters"]:
-                element["value"] += frequencies[letter]
-        return
+        weights = [0] * len(self.words.alphabet)
+        for board in self.unsolved():
+            frequencies = board.frequencies or self.words.frequencies
+            for letter in range(len(weights)):
+                # letters already known to appear on a board are not useful
+                if not board.constraints.minimum[letter]:
+                    weights[letter] += frequencies[letter]
+        return weights
 
-    def sort_by_value(self):
+    def most_informative(self):
         """
-        Sorts the entire dataset based on how valuable each word is.
+        Chooses the word whose results are expected to reveal the most about
+        which words may be correct, adding up the information over every
+        board.
 
         Arguments:
             None, but operates on existing class attributes
 
         Returns:
-            None, but updates existing class attributes
+            index: integer
+                the index of the word to guess next
+        """
+
+        # boards with the same candidates are only measured once
+        repeats = {}
+        for board in self.unsolved():
+            repeats[board.candidates] = repeats.get(board.candidates, 0) + 1
+        totals = [0.0] * len(self.words.words)
+        possible = set()
+        for candidates, repeat in repeats.items():
+            entropies = self.words.get_entropies(candidates)
+            for index in range(len(totals)):
+                totals[index] += entropies[index] * repeat
+            possible.update(bits_to_indices(candidates))
+        # between equally informative words, prefer one that may be right
+        return max(range(len(totals)),
+            key=lambda index: (totals[index], index in possible))
+
+    def update(self, guess, results):
         """
+        Narrows down the possible words of every board using the results of
+        a guess.
+
+        Arguments:
+            guess: string
+                word that was guessed
+            results: list of strings
+                string of colours given in response to the guess on each board
+                that is not yet solved, in order
 
-        # define sorting function so words can be sorted by their value
-        def word_value_key(word):
-            # returns the value of a particular word in the set
-            return word["value"]
+        Returns:
+            None, but updates existing class attributes
+        """
 
-        # sort dataset in descending order for easy access to first element
-        self.wordset.sort(reverse=True, key=word_value_key)
+        unsolved = [number for number in range(len(self.boards)) \
+            if not self.solved[number]]
+        if len(results) != len(unsolved):
+            raise ValueError("expected {} results but got {}".format(
+                len(unsolved), len(results)))
+        for result in results:
+            if len(result) != len(guess) or set(result) - set("byg"):
+                raise ValueError("{} is not a result of {}".format(result,
+                    guess))
+        for number, result in zip(unsolved, results):
+            if result == "g" * len(result):
+                self.solved[number] = True
+            else:
+                self.boards[number].update(guess, result)
         return
 
 
-def wordle_solve(infilename):
+def next_guess(word_list_id, history, strategy=STRATEGIES[0], depth=2,
+    hard=False, length=None):
+    """
+    Gives the word to guess next after any history of guesses, without
+    keeping anything about the game between calls.
+
+    Arguments:
+        word_list_id: string
+            the name of the file containing all possible words
+        history: list of tuples of strings
+            every guess made so far along with its result
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        depth: integer
+            the number of opening guesses to look up rather than work out
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+        length: integer
+            number of letters in the word, by default that of the first guess
+            or of most words in the file if nothing has been guessed
+
+    Returns:
+        test_word: string
+            the word to guess next
+    """
+
+    # equal histories must look the same to the cache however they are given
+    history = tuple((guess, result) for guess, result in history)
+    if length is None and history:
+        length = len(history[0][0])
+    return cached_guess(word_list_id, history, strategy, depth, bool(hard),
+        length)
+
+
+@lru_cache(maxsize=GUESS_CACHE_SIZE)
+def cached_guess(word_list_id, history, strategy, depth, hard, length=None):
+    """
+    Works out the word to guess next after a history of guesses, which is
+    remembered for the most recently requested histories.
+
+    Arguments:
+        word_list_id: string
+            the name of the file containing all possible words
+        history: tuple of tuples of strings
+            every guess made so far along with its result
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        depth: integer
+            the number of opening guesses to look up rather than work out
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+        length: integer
+            number of letters in the word, or None for the length of most
+            words in the file
+
+    Returns:
+        test_word: string
+            the word to guess next
+    """
+
+    if length is None:
+        # found once, so asking for the default length or for the same
+        # length by number shares one set of words
+        if word_list_id not in default_lengths:
+            words = WordSet(word_list_id)
+            default_lengths[word_list_id] = words.length
+            word_lists.setdefault((word_list_id, words.length), words)
+        length = default_lengths[word_list_id]
+    # words of each length in the same file are kept apart
+    if (word_list_id, length) not in word_lists:
+        word_lists[word_list_id, length] = WordSet(word_list_id, length)
+    words = word_lists[word_list_id, length]
+    key = (word_list_id, words.length, strategy, depth, hard)
+    if key not in opening_books:
+        opening_books[key] = OpeningBook(word_list_id,
+            Game(words, strategy, hard=hard), depth).guesses
+
+    game = Game(words, strategy, opening_books[key], hard)
+    game.replay(history)
+    if not game.count():
+        raise ValueError("no words are left after the given results")
+    return game.next_guess()
+
+
+def start_worker(words, length=None, test_words=None, settings=None):
+    """
+    Loads the data a process needs to run many tasks of the same kind, such
+    as games to play or policies to try, so it is only loaded once. Given
+    as the initializer of a pool of processes, or called directly when a
+    single process does all the work.
+
+    Arguments:
+        words: string or WordSet
+            the name of the file containing all possible words, or the words
+            already loaded by this process
+        length: integer
+            number of letters in each word, by default the length of most
+            words in the file
+        test_words: list of strings
+            the answers to look up the result of every guess against, or
+            None if the tasks need no table of results
+        settings: dictionary
+            anything else every task needs, such as the strategy, kept as
+            given
+
+    Returns:
+        None, but stores the data in worker_data for later calls in the same
+        process
+    """
+
+    worker_data.clear()
+    worker_data.update(settings or {})
+    if not isinstance(words, WordSet):
+        words = WordSet(words, length)
+    worker_data["words"] = words
+    if test_words is not None:
+        worker_data["test_words"] = test_words
+        worker_data["matrix"] = FeedbackMatrix(words.words, test_words)
+    return
+
+
+def indices_to_bits(indices, size):
+    """
+    Builds a set of words represented as the bits of an integer.
+
+    Arguments:
+        indices: list of integers
+            the index of each word in the set
+        size: integer
+            the number of words in the entire dataset
+
+    Returns:
+        bits: integer
+            has the bit of each word in the set turned on
+    """
+
+    if not size:
+        return 0
+    digits = bytearray(b"0" * size)
+    for index in indices:
+        digits[size - 1 - index] = ord("1")    # lowest bit is the last digit
+    return int(digits, 2)
+
+
+def bits_to_indices(bits):
+    """
+    Lists the words in a set represented as the bits of an integer.
+
+    Arguments:
+        bits: integer
+            has the bit of each word in the set turned on
+
+    Returns:
+        indices: list of integers
+            the index of each word in the set, in increasing order
+    """
+
+    digits = bin(bits)[:1:-1]    # lowest bit first, without the prefix
+    indices = []
+    index = digits.find("1")
+    while index != -1:
+        indices.append(index)
+        index = digits.find("1", index + 1)
+    return indices
+
+
+def count_bits(bits):
+    """
+    Counts the words in a set represented as the bits of an integer.
+
+    Arguments:
+        bits: integer
+            has the bit of each word in the set turned on
+
+    Returns:
+        count: integer
+            the number of words in the set
+    """
+
+    if hasattr(bits, "bit_count"):
+        return bits.bit_count()    # only available from Python 3.10
+    return bin(bits).count("1")
+
+
+def is_index(filename):
+    """
+    Checks whether a file is a binary index rather than a text file of words.
+
+    Arguments:
+        filename: string
+            name of the file to check
+
+    Returns:
+        result: boolean
+            whether the file starts the way every index does
+    """
+
+    with open(filename, "rb") as infile:
+        return infile.read(len(INDEX_MAGIC)) == INDEX_MAGIC
+
+
+def index_sections(length, size, letters):
+    """
+    Gives the size of each section of a binary index, after the header.
+
+    Arguments:
+        length: integer
+            number of letters in each word
+        size: integer
+            number of words in the index
+        letters: integer
+            number of letters in the alphabet
+
+    Returns:
+        sections: list of integers
+            the number of bytes in each section, padded to a multiple of 8
+    """
+
+    width = (size + 7) // 8
+    sections = [
+        size * length * 4,    # every word, one after another, as UTF-32
+        letters * 4,    # every letter of the alphabet in order, as UTF-32
+        length * size,    # letter codes, one position at a time
+        length * size,    # letter codes with repeats coded past the alphabet
+        size * letters,    # count of each letter in each word
+        size * 8,    # set of letters in each word
+        size * 4,    # value of each word
+        letters * width,    # set of words containing each letter
+        length * letters * width,    # set of words with each letter in a spot
+    ]
+    return [section + -section % 8 for section in sections]
+
+
+def little_endian(data):
+    """
+    Gives the bytes of an array in little-endian order on any machine.
+
+    Arguments:
+        data: array of integers
+            the array to convert, which may be changed in place
+
+    Returns:
+        data: bytes
+            the contents of the array
+    """
+
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+def native_array(data, typecode):
+    """
+    Reads little-endian integers without copying them when possible.
+
+    Arguments:
+        data: memoryview
+            the bytes to read
+        typecode: string
+            the type of integer stored, as used by the array module
+
+    Returns:
+        data: memoryview or array
+            the integers, indexable in the same way either way
+    """
+
+    if sys.byteorder == "little":
+        return data.cast(typecode)
+    result = array(typecode, bytes(data))
+    result.byteswap()
+    return result
+
+
+def wordle_solve(infilename, strategy=STRATEGIES[0], depth=2, hard=False,
+    metrics=None, budget=None, length=None):
     """
     Guesses the secret word according to input corresponding to the output of
     the game Wordle.
@@ -164,89 +1859,216 @@ def wordle_solve(infilename):
     Arguments:
         infilename: string
             the name of the file containing all possible words
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        depth: integer
+            the number of opening guesses to look up rather than work out
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+        metrics: function
+            given a dictionary measuring each guess and each update, or None
+            to measure nothing
+        budget: float
+            the most seconds to search for a guess sure to finish in time on
+            each turn, or None to never search
+        length: integer
+            number of letters in the word, by default the length of most
+            words in the file
 
     Returns:
         None, but continually prints words to try until the word is found
     """
 
-    valid_words = WordSet(infilename)    # set of words that can be correct
-    all_words = WordSet(infilename)    # set of all possible valid words
-    letters = {}    # dictionary of each letters count
-    for letter in range(26):
-        # letter is assumed not present until proven otherwise
-        letters[chr(ord("a") + letter)] = False
+    words = WordSet(infilename, length)    # set of all possible valid words
+    book = OpeningBook(infilename, Game(words, strategy, hard=hard), depth)
+    # what is known about this game
+    game = Game(words, strategy, book.guesses, hard, metrics,
+        search=None if budget is None else Search(words, budget))
     results = [0]    # initialize number of guesses
     # keep guessing as long as the set of valid words is not empty
     while(True):
-        if not len(valid_words.wordset):
+        if not game.count():
             print("There was an error in the program.")
             break    # invalid input lead to no words being left, exit program
 
-        # guess valuable words until set is narrowed down enough
-        if len(valid_words.wordset) > len(all_words.wordset) / 500 + 1:
-            test_word = all_words.wordset[0]["word"]
-        # guess a word that may be correct
-        else:
-            test_word = valid_words.wordset[0]["word"]
-            valid_words.wordset.pop(0)    # never guess same word twice
+        test_word = game.next_guess()
+        print("Now try:", test_word)    # tell user what to guess next
+        while True:
+            result = input("Enter result: ")    # obtain response to the guess
+            try:
+                if result != "g" * len(test_word):
+                    game.update(test_word, result)
+            except ValueError as error:
+                # a mistyped result is asked for again, not counted
+                print("Error: {}.".format(error))
+            else:
+                break
+        results[0] += 1    # one more guess has been entered
+        results.append(result)    # make note of result of guess
+
+        if result == "g" * len(test_word):
+            print_results(results)    # print shareable results
+            break    # code cracked, exit program
+    return
+
+
+def wordle_solve_boards(infilename, number, strategy=STRATEGIES[0],
+    length=None):
+    """
+    Guesses the secret words of several boards at once, as in Quordle or
+    Octordle, according to input corresponding to the output of each board.
+
+    Arguments:
+        infilename: string
+            the name of the file containing all possible words
+        number: integer
+            the number of boards played at once
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        length: integer
+            number of letters in each word, by default the length of most
+            words in the file
+
+    Returns:
+        None, but continually prints words to try until every word is found
+    """
+
+    words = WordSet(infilename, length)    # set of all possible valid words
+    game = MultiGame(words, number, strategy)    # what is known about each
+    attempts = 0    # initialize number of guesses
+    while not all(game.solved):
+        if not all(board.count() for board in game.unsolved()):
+            print("There was an error in the program.")
+            break    # invalid input lead to no words being left, exit program
+
+        test_word = game.next_guess()
+        print("Now try:", test_word)    # tell user what to guess next
+        while True:
+            # obtain the response on every board still being played, in order
+            results = input("Enter results of {} boards: ".format(
+                len(game.unsolved()))).split()
+            try:
+                game.update(test_word, results)
+            except ValueError as error:
+                # mistyped results are asked for again, not counted
+                print("Error: {}.".format(error))
+            else:
+                break
+        attempts += 1    # one more guess has been entered
+    else:
+        print("Solved all {} boards in {} attempts".format(number, attempts))
+    return
+
+
+def write_metrics(outfile):
+    """
+    Gives a metrics function that writes each measurement as it is made.
+
+    Arguments:
+        outfile: file
+            where measurements are written, one line of JSON each
+
+    Returns:
+        metrics: function
+            given a dictionary measuring a step of a game
+    """
+
+    def metrics(timings):
+        outfile.write(json.dumps(timings) + "\n")
+        outfile.flush()    # slow turns are often the ones never finished
+        return
+
+    return metrics
+
+
+def tree_solve(infilename):
+    """
+    Guesses the secret word according to input corresponding to the output of
+    the game Wordle, by only following a compiled decision tree.
+
+    Arguments:
+        infilename: string
+            the name of the file containing the decision tree
+
+    Returns:
+        None, but continually prints words to try until the word is found
+    """
+
+    tree = DecisionTree()
+    tree.load(infilename)
+    results = [0]    # initialize number of guesses
+    while(True):
+        test_word = tree.play(results[1:])
+        if test_word is None:
+            print("There was an error in the program.")
+            break    # result never occurs for any answer, exit program
 
         print("Now try:", test_word)    # tell user what to guess next
         result = input("Enter result: ")    # obtain response to the guess
         results[0] += 1    # one more guess has been entered
         results.append(result)    # make note of result of guess
-        words_to_remove = []
 
-        if result == "ggggg":
+        if result == "g" * len(test_word):
             print_results(results)    # print shareable results
             break    # code cracked, exit program
+    return
 
-        # iterate through each letter of the guessed word
-        for number in range(len(result)):
-            if result[number] == "g":
-                letters[test_word[number]] = True    # letter is present
-                # words are only valid with that letter in that exact spot
-                for index in range(len(valid_words.wordset)):
-                    if valid_words.wordset[index]["word"][number] \
-                        != test_word[number]:
-                        words_to_remove.append(index)
-
-            elif result[number] == "y":
-                letters[test_word[number]] = True    # letter is present
-                # words are only valid with that letter, but not in that spot
-                for index in range(len(valid_words.wordset)):
-                    if test_word[number] not in valid_words.wordset[index] \
-                        ["letters"]:
-                        words_to_remove.append(index)
-                    if test_word[number] == valid_words.wordset[index] \
-                        ["word"][number]:
-                        words_to_remove.append(index)
-
-            elif result[number] == "b":
-                # words are only valid if they do not contain that letter, but
-                # exception is for letters that reoccured in the guess
-                for index in range(len(valid_words.wordset)):
-                    if test_word[number] in valid_words.wordset[index] \
-                        ["letters"] and test_word.count(test_word[number]) \
-                        == 1:
-                        words_to_remove.append(index)
-
-        # put in descending order to avoid popping glitches
-        words_to_remove.sort(reverse=True)
-        # remove any and all words that are not possibly correct
-        words_to_remove.insert(0, -1)    # so comparison remains valid
-        for index in range(1, len(words_to_remove)):
-            if words_to_remove[index] != words_to_remove[index - 1]:
-                valid_words.wordset.pop(words_to_remove[index])
-
-        # find most common letters to eliminate in the possibly correct set
-        frequencies = valid_words.count_frequencies()
-        for letter in frequencies:
-            # letters that are already known to appear are not useful
-            if letters[letter]:
-                frequencies[letter] = 0
-        # re-sort based on value inside the other set to best narrow down
-        all_words.set_values(frequencies)
-        all_words.sort_by_value()
+
+def compile_tree(infilename, outfilename, answerfilename=None,
+    strategy=STRATEGIES[0], depth=2, hard=False, budget=None, length=None):
+    """
+    Plays the solver against every answer to build its whole decision tree,
+    and reports exactly how well it does.
+
+    Arguments:
+        infilename: string
+            the name of the file containing all possible words
+        outfilename: string
+            the name of the file to store the decision tree in
+        answerfilename: string
+            the name of the file containing all answers to solve, or None to
+            solve every possible word
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        depth: integer
+            the number of opening guesses to look up rather than work out
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+        budget: float
+            the most seconds to search for a guess sure to finish in time on
+            each turn, or None to never search
+        length: integer
+            number of letters in each word, by default the length of most
+            words in the file
+
+    Returns:
+        None, but creates a file containing the decision tree
+    """
+
+    words = WordSet(infilename, length)    # set of all possible valid words
+    if answerfilename is None:
+        answers = list(words.words)
+    else:
+        with open(answerfilename) as infile:
+            answers = [answer for answer in infile.read().split() \
+                if len(answer) == words.length]
+    book = OpeningBook(infilename, Game(words, strategy, hard=hard), depth)
+    tree = DecisionTree()
+    tree.compile(Game(words, strategy, book.guesses, hard,
+        search=None if budget is None else Search(words, budget)), answers)
+    tree.save(outfilename)
+
+    # the tree holds every game, so no game has to be played again to judge it
+    attempts = tree.attempts()
+    solved = {number: count for number, count in attempts.items() \
+        if number is not None}
+    print("Wrote decision tree of {} answers to {}".format(len(answers),
+        outfilename))
+    print("TOOK AN AVERAGE OF {:.3f} ATTEMPTS".format(
+        sum(number * count for number, count in solved.items()) \
+        / max(1, sum(solved.values()))))
+    print("TOOK AT MOST {} ATTEMPTS".format(max(solved, default=0)))
+    print("COULD NOT SOLVE {} ANSWERS".format(attempts.get(None, 0)))
     return
 
 
@@ -290,20 +2112,89 @@ def main():
         words to try until the word is found
     """
 
-    # check that file is specified
-    if len(sys.argv) != 2:
-        print("Error: no input file specified.",
-            "Proper Usage: python3 wordle_solver.py <filename>")
-        return
+    parser = argparse.ArgumentParser(
+        description="Suggests words to guess to solve a game of Wordle.")
+    parser.add_argument("infilename",
+        help="text file of all possible words, or a binary index of them, "
+        "or a decision tree with --tree")
+    parser.add_argument("--write-index", metavar="OUTFILENAME",
+        help="store the processed words in a binary index and exit")
+    parser.add_argument("--strategy", choices=STRATEGIES,
+        default=STRATEGIES[0], help="how to choose the next guess")
+    parser.add_argument("--book-depth", metavar="N", type=int,
+        help="number of opening guesses to precompute and store, 0 for none, "
+        "2 by default")
+    parser.add_argument("--hard", action="store_true",
+        help="only suggest guesses using every hint revealed so far")
+    parser.add_argument("--metrics", metavar="OUTFILENAME",
+        help="write measurements of every turn as lines of JSON")
+    parser.add_argument("--boards", metavar="N", type=int, default=1,
+        help="play N boards at once, as in Quordle or Octordle")
+    parser.add_argument("--search", metavar="SECONDS", type=float,
+        help="once few words are left, search for guesses sure to solve "
+        "every word within six attempts, for at most this long each turn")
+    parser.add_argument("--compile-tree", metavar="OUTFILENAME",
+        help="store every guess made against every answer and exit")
+    parser.add_argument("--answers", metavar="ANSWERFILENAME",
+        help="text file of the answers to compile the tree for")
+    parser.add_argument("--tree", action="store_true",
+        help="only follow the decision tree given as the input file")
+    parser.add_argument("--length", metavar="N", type=int,
+        help="only use words of N letters, by default the length of most "
+        "words in the file")
+    args = parser.parse_args()
 
     # check that the specified file exists
-    infilename = sys.argv[1]
+    infilename = args.infilename
     if not os.path.exists(infilename):
         print("Error: input file specified does not exist.",
             "Proper Usage: python3 wordle_solver.py <filename>")
         return
+    if args.boards > 1:
+        # several boards are played without any of these, so none is ignored
+        given = [option for option, value in (("--hard", args.hard),
+            ("--search", args.search is not None),
+            ("--metrics", args.metrics is not None),
+            ("--book-depth", args.book_depth is not None),
+            ("--compile-tree", args.compile_tree is not None),
+            ("--tree", args.tree)) if value]
+        if given:
+            print("Error: {} cannot be used with --boards.".format(
+                ", ".join(given)))
+            return
+    depth = 2 if args.book_depth is None else args.book_depth
 
-    wordle_solve(infilename)    # solve particular instance of the game
+    try:
+        if args.write_index:
+            # process the words once so later runs only map the index
+            words = WordSet(infilename, args.length)
+            words.write_index(args.write_index)
+            print("Wrote index of {} words to {}".format(len(words.words),
+                args.write_index))
+            return
+        if args.compile_tree:
+            compile_tree(infilename, args.compile_tree, args.answers,
+                args.strategy, depth, args.hard, args.search,
+                args.length)
+            return
+        if args.tree:
+            tree_solve(infilename)    # no words are read at all
+            return
+        if args.boards > 1:
+            wordle_solve_boards(infilename, args.boards, args.strategy,
+                args.length)
+            return
+        # solve particular instance of the game
+        if args.metrics:
+            with open(args.metrics, "w") as outfile:
+                wordle_solve(infilename, args.strategy, depth,
+                    args.hard, write_metrics(outfile), args.search,
+                    args.length)
+        else:
+            wordle_solve(infilename, args.strategy, depth,
+                args.hard, budget=args.search, length=args.length)
+    except ValueError as error:
+        print("Error: {}.".format(error))
     return
 
 
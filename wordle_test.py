@@ -1,164 +1,29 @@
 # Made by Isaac Joffe
 
-import sys    # for command line arguments
+import argparse    # for command line arguments
 import os.path    # to check that file exists
 import time
+import multiprocessing    # to solve many words at once
+import json    # to write measurements of every turn
+import hashlib    # to tell when the words a checkpoint was made from change
 
+# to give results of guesses
+from feedback import wordle, FeedbackMatrix, BatchOracle
+# to hold and filter sets of words
+from wordle_solver import WordSet, Game, MultiGame, STRATEGIES
+# to load the words once in each process
+from wordle_solver import start_worker, worker_data
+from opening_book import OpeningBook    # to look up opening guesses
+from search import Search    # to make sure games finish in time
+from adversary import Adversary    # to find the worst case for certain
 
-class WordSet():
-    """
-    A class to hold the set of all valid Wordle words.
-
-    Attributes:
-        wordset: list of dictionaries
-            contains all valid Wordle words along with data on what letters
-            the word conatins and how useful the word is
-
-    Methods:
-        get_base_words(filename):
-            reads a text file containing all valid words separated by spaces
-        count_letters():
-            counts the number of letters that occur in each word
-        count_frequencies():
-            determines the number of times each letter occurs in the dataset
-        set_values(frequencies):
-            calculates the value of a word based on how common its letters are
-        sort_by_value():
-            sorts the list of words based on their value
-    """
-
-    def __init__(self, filename):
-        """
-        Fully creates and serializes all data based on an input file.
-
-        Arguments:
-            filename: string
-                name of the text file to read words from
-
-        Returns:
-            None, but creates a serialized version of the word data
-        """
-
-        self.wordset = []
-        self.frequencies = {}
-
-        # execute steps to build the serilaized data
-        self.get_base_words(filename)
-        self.count_letters()
-        frequencies = self.count_frequencies()
-        self.set_values(frequencies)
-        self.sort_by_value()
-        return
-
-    def get_base_words(self, filename):
-        """
-        Reads in all possible words into memory.
-
-        Arguments:
-            filename: string
-                name of the text file to read words from
-
-        Returns:
-            None, but creates a basic skeleton of the data structure
-        """
-
-        with open(filename) as infile:
-            words = infile.read().split()    # words are separated by spaces
-        for word in words:
-            # create base attributes of each word
-            self.wordset.append({"word": word, "letters": {}, "value": 0})
-        return
-
-    def count_letters(self):
-        """
-        Counts which letters occur in each word and how often the occur.
-
-        Arguments:
-            None, but operates on existing class attributes
-
-        Returns:
-            None, but updates existing class attributes
-        """
-
-        for element in self.wordset:
-            # count each letter in each word and store in the words dictionary
-            for letter in element["word"]:
-                if letter not in element["letters"]:
-                    element["letters"][letter] = 1
-                else:
-                    element["letters"][letter] += 1
-        return
-
-    def count_frequencies(self):
-        """
-        Counts how often each letter occurs in the entire dataset.
-
-        Arguments:
-            None, but operates on existing class attributes
-
-        Returns:
-            frequencies: dictionary
-                holds the number of times each letter occurs in the dataset
-        """
-
-        frequencies = {}    # dictionary of each letters count
-        for letter in range(26):
-            frequencies[chr(ord("a") + letter)] = 0
-        for element in self.wordset:
-            # count every letter in every word to keep track fo frequency
-            for letter in element["letters"]:
-                frequencies[letter] += 1
-
-        """
-        # optional normalization of data
-        total = len(self.wordset) * 5
-        for letter in self.frequencies.keys():
-            self.frequencies[letter] /= total
-        """
-        return frequencies
-
-    def set_values(self, frequencies):
-        """
-        Sets the value of each word in terms of how often its letters occur.
-
-        Arguments:
-            frequencies: dictionary
-                holds the number of times each letter occurs in the dataset
-
-        Returns:
-            None, but updates existing class attributes
-        """
-
-        for element in self.wordset:
-            element["value"] = 0
-            # compute value of each word based on how useful each distinct
-            # letter inside it, double letters are not counted again
-            for letter in element["letters"]:
-                element["value"] += frequencies[letter]
-        return
 
-    def sort_by_value(self):
-        """
-        Sorts the entire dataset based on how valuable each word is.
+CHECKPOINT_VERSION = 1    # bump whenever the layout of checkpoints changes
+GAVE_UP = 28    # attempts counted for a game the solver could not finish
 
-        Arguments:
-            None, but operates on existing class attributes
 
-        Returns:
-            None, but updates existing class attributes
-        """
-
-        # define sorting function so words can be sorted by their value
-        def word_value_key(word):
-            # returns the value of a particular word in the set
-            return word["value"]
-
-        # sort dataset in descending order for easy access to first element
-        self.wordset.sort(reverse=True, key=word_value_key)
-        return
-
-
-def wordle_solve(word, infilename):
+def wordle_solve(word, words, matrix=None, strategy=STRATEGIES[0],
+    book=None, hard=False, metrics=None, search=None, policy=None):
     """
     Guesses the secret word according to input corresponding to the output of
     the game Wordle.
@@ -166,128 +31,221 @@ def wordle_solve(word, infilename):
     Arguments:
         word: string
             the word that is being solved
-        infilename1: string
-            the name of the file containing the data on all possible words
+        words: WordSet
+            the data on all possible words, shared so it is only read once
+        matrix: FeedbackMatrix
+            precomputed results of every guess, computed directly if not given
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        book: dictionary
+            holds the guess to make after each history of guesses
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+        metrics: function
+            given a dictionary measuring each guess and each update, or None
+            to measure nothing
+        search: Search
+            makes sure every possible word is solved within six attempts once
+            few are left, or None to never check
+        policy: ThresholdPolicy
+            decides when to stop probing, the policy stored with the words if
+            not given
 
     Returns:
         number: integer
-            the number of guesses the solver took to solve the word
+            the number of guesses the solver took to solve the word, or
+            GAVE_UP if it was never solved
     """
 
-    valid_words = WordSet(infilename)    # set of words that can be correct
-    all_words = WordSet(infilename)    # set of all possible valid words
-    letters = {}    # dictionary of each letters count
-    for letter in range(26):
-        # letter is assumed not present until proven otherwise
-        letters[chr(ord("a") + letter)] = False
+    # what is known about this game
+    game = Game(words, strategy, book, hard, metrics, policy, search)
     results = [0]    # initialize number of guesses
     # keep guessing as long as the set of valid words is not empty
     while(True):
-        if not len(valid_words.wordset):
+        if not game.count() or results[0] == GAVE_UP:
             print("There was an error in the program.")
-            break    # invalid input led to no words being left, exit program
+            return GAVE_UP    # no words are left, so the word is not solved
 
-        # guess valuable words until set is narrowed down enough
-        if len(valid_words.wordset) > len(all_words.wordset) / 500 + 1:
-            test_word = all_words.wordset[0]["word"]
-        # guess a word that may be correct
+        test_word = game.next_guess()
+        # obtain response to the guess, from the precomputed table if given
+        if matrix is None:
+            result = wordle(word, test_word)
         else:
-            test_word = valid_words.wordset[0]["word"]
-            valid_words.wordset.pop(0)    # never guess same word twice
-
-        result = wordle(word, test_word)    # obtain response to the guess
+            result = matrix.result(test_word, word)
         results[0] += 1    # one more guess has been entered
         results.append(result)    # make note of result of guess
-        words_to_remove = []
 
-        if result == "ggggg":
+        if result == "g" * len(test_word):
             break    # code cracked, exit program
 
-        # iterate through each letter of the guessed word
-        for number in range(len(result)):
-            if result[number] == "g":
-                letters[test_word[number]] = True
-                # words are only valid with that letter in that exact spot
-                for index in range(len(valid_words.wordset)):
-                    if valid_words.wordset[index]["word"][number] \
-                        != test_word[number]:
-                        words_to_remove.append(index)
-
-            elif result[number] == "y":
-                letters[test_word[number]] = True
-                # words are only valid with that letter, but not in that spot
-                for index in range(len(valid_words.wordset)):
-                    if test_word[number] not in valid_words.wordset[index] \
-                        ["letters"]:
-                        words_to_remove.append(index)
-                    if test_word[number] == valid_words.wordset[index] \
-                        ["word"][number]:
-                        words_to_remove.append(index)
-
-            elif result[number] == "b":
-                # words are only valid if they do not contain that letter, but
-                # exception is for letters that reoccured in the guess
-                for index in range(len(valid_words.wordset)):
-                    if test_word[number] in valid_words.wordset[index] \
-                        ["letters"] and test_word.count(test_word[number]) \
-                        == 1:
-                        words_to_remove.append(index)
-
-        # put in descending order to avoid popping glitches
-        words_to_remove.sort(reverse=True)
-        # remove any and all words that are not possibly correct
-        words_to_remove.insert(0, -1)    # so comparison remains valid
-        for index in range(1, len(words_to_remove)):
-            if words_to_remove[index] != words_to_remove[index - 1]:
-                valid_words.wordset.pop(words_to_remove[index])
-
-        # find most common letters to eliminate in the possibly correct set
-        frequencies = valid_words.count_frequencies()
-        for letter in frequencies:
-            # letters that are already known to appear are not useful
-            if letters[letter]:
-                frequencies[letter] = 0
-        # re-sort based on value inside the other set to best narrow down
-        all_words.set_values(frequencies)
-        all_words.sort_by_value()
+        game.update(test_word, result)
 
     number = len(results) - 1     # amount of attempts required
     return number
 
 
-def wordle(word, guess):
+def wordle_solve_boards(answers, words, strategy=STRATEGIES[0]):
     """
-    Gives the colour-based response to an word-guess pair, exactly how Wordle
-    itself would.
+    Guesses the secret words of several boards at once, making every guess on
+    each board that is not yet solved.
 
     Arguments:
-        word: string
-            secret word trying to be cracked
-        guess: string
-            word being guessed by the wordle solver
+        answers: tuple of strings
+            the word that is being solved on each board
+        words: WordSet
+            the data on all possible words, shared so it is only read once
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
 
     Returns:
-        result: string
-            string of colours to be interpreted by the solver
+        number: integer
+            the number of guesses the solver took to solve every board, or
+            GAVE_UP if some board was never solved
     """
 
-    # elementary implemmetation of basic wordle algorithm for testing
-    result = ""
-    for index in range(len(guess)):
-        if guess[index] == word[index]:
-            result += "g"
-        elif guess[index] not in word:
-            result += "b"
-        else:
-            # may fail in some instances but seems to work
-            if guess.count(guess[index]) > word.count(guess[index]):
-                result += "b"
-            else:
-                result += "y"
-    return result
+    game = MultiGame(words, len(answers), strategy)
+    # gives the result on every board with a single row per guess
+    oracle = BatchOracle(list(answers))
+    number = 0    # initialize number of guesses
+    while not all(game.solved):
+        if number == GAVE_UP or not all(board.count() \
+            for board in game.unsolved()):
+            print("There was an error in the program.")
+            return GAVE_UP    # an answer is not a valid word, so not solved
 
+        test_word = game.next_guess()
+        results = oracle.results(test_word)
+        number += 1    # one more guess has been entered
+        game.update(test_word, [results[board] \
+            for board in range(len(answers)) if not game.solved[board]])
+    return number
 
-def test(infilename1, infilename2):
+
+def solve_word(word):
+    """
+    Solves a single word using the data loaded by start_worker, with the
+    strategy, book, mode, measuring and search budget of the sweep.
+
+    Arguments:
+        word: string or tuple of strings
+            the word that is being solved, or the word of each board
+
+    Returns:
+        number: integer
+            the number of guesses the solver took to solve the word
+        timings: list of dictionaries
+            the measurements of every turn, or None if not measured
+    """
+
+    if isinstance(word, tuple):
+        # several boards are played at once, which is never measured
+        return wordle_solve_boards(word, worker_data["words"],
+            worker_data["strategy"]), None
+    if "search" not in worker_data:
+        # made once in each process, as it remembers what it works out
+        worker_data["search"] = None if worker_data["budget"] is None \
+            else Search(worker_data["words"], worker_data["budget"])
+    timings = [] if worker_data["measure"] else None
+    number = wordle_solve(word, worker_data["words"], worker_data["matrix"],
+        worker_data["strategy"], worker_data["book"], worker_data["hard"],
+        None if timings is None else timings.append, worker_data["search"])
+    return number, timings
+
+
+def sweep_digest(words, test_words, policy):
+    """
+    Gives a hash of everything the results of a sweep depend on beyond its
+    options, so a checkpoint is never carried on after the words change.
+
+    Arguments:
+        words: WordSet
+            the data on all possible words, along with its prior
+        test_words: list of strings
+            all words to test on
+        policy: ThresholdPolicy
+            decides when the games of the sweep stop probing
+
+    Returns:
+        digest: string
+            a hash of the words, the words to test on, the policy and the
+            prior
+    """
+
+    digest = hashlib.sha256()
+    digest.update(" ".join(words.words).encode())
+    digest.update(b"\n")
+    digest.update(" ".join(test_words).encode())
+    digest.update(b"\n")
+    digest.update(json.dumps(policy.describe(), sort_keys=True).encode())
+    if words.priors is not None:
+        digest.update(json.dumps(list(words.priors)).encode())
+    return digest.hexdigest()
+
+
+def read_checkpoint(filename, settings, names):
+    """
+    Reads the games already played by an earlier run of the same sweep,
+    dropping any last line left half written when that run was stopped. The
+    file is never changed unless it starts with the header of this sweep.
+
+    Arguments:
+        filename: string
+            name of the checkpoint file, which need not exist yet
+        settings: dictionary
+            everything that changes the result of a game, which must match
+            the settings the checkpoint was started with
+        names: list of strings
+            the answer of each game, or its answers separated by slashes
+
+    Returns:
+        done: dictionary
+            holds the number of attempts taken by each game already played,
+            by its position in the sweep
+    """
+
+    if not os.path.exists(filename) or not os.path.getsize(filename):
+        return {}
+    with open(filename, "rb") as infile:
+        data = infile.read()
+    # the header is written and synced before any game, so a file without
+    # a whole first line is not a checkpoint
+    if b"\n" not in data:
+        raise ValueError("{} is not a valid checkpoint".format(filename))
+    try:
+        header = json.loads(data[:data.index(b"\n")].decode())
+    except ValueError:
+        raise ValueError("{} is not a valid checkpoint".format(filename))
+    if not isinstance(header, dict) or "checkpoint" not in header:
+        raise ValueError("{} is not a valid checkpoint".format(filename))
+    if header != {"checkpoint": CHECKPOINT_VERSION, "settings": settings}:
+        raise ValueError("{} is a checkpoint of a different sweep".format(
+            filename))
+
+    complete = data[:data.rfind(b"\n") + 1]
+    if len(complete) != len(data):
+        # the last game was being written when the run was stopped
+        with open(filename, "r+b") as outfile:
+            outfile.truncate(len(complete))
+    lines = complete.decode().splitlines()
+    done = {}
+    for line in lines[1:]:
+        try:
+            entry = json.loads(line)
+            number = entry["game"]
+            word = names[number]
+            attempts = int(entry["attempts"])
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise ValueError("{} is not a valid checkpoint".format(filename))
+        if word != entry["word"]:
+            raise ValueError("{} is a checkpoint of a different sweep".format(
+                filename))
+        done[number] = attempts
+    return done
+
+
+def test(infilename1, infilename2, jobs=1, strategy=STRATEGIES[0], depth=2,
+    hard=False, metrics=None, budget=None, boards=1, length=None,
+    checkpoint=None):
     """
     Guesses the secret word according to input corresponding to the output of
     the game Wordle.
@@ -297,37 +255,148 @@ def test(infilename1, infilename2):
             the name of the file containing all possible words
         infilename2: string
             the name of the file containing all words ton test on
+        jobs: integer
+            the number of processes to solve words with at once
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        depth: integer
+            the number of opening guesses to look up rather than work out
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+        metrics: file
+            where to write measurements of every turn, one line of JSON each,
+            or None to measure nothing
+        budget: float
+            the most seconds to search for a guess sure to finish in time on
+            each turn, or None to never search
+        boards: integer
+            the number of boards played at once, each game taking the next
+            words in the file as its answers
+        length: integer
+            number of letters in each word, by default the length of most
+            possible words, with test words of other lengths left out
+        checkpoint: string
+            name of the file to note the result of every game in as soon as
+            it is played, so a stopped run can carry on where it left off,
+            or None to keep nothing
 
     Returns:
         None, but tests the solver against all possible instances
     """
+
+    if boards + 5 >= GAVE_UP:
+        # a game given up on must never fall within the limit
+        raise ValueError("at most {} boards can be played at once".format(
+            GAVE_UP - 6))
+    if boards > 1 and (hard or metrics is not None or budget is not None):
+        # several boards are played without any of these
+        raise ValueError("hard mode, metrics and search cannot be used with "
+            "several boards")
     # number of times each amount of attempts is taken
     results = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
     # store all words to test on as a list
     with open(infilename1) as infile:
         test_words = infile.read().split()
+    # may be a text file or a binary index
+    words = WordSet(infilename2, length)
+    test_words = [word for word in test_words if len(word) == words.length]
+    # results of every guess against every word are computed only once
+    FeedbackMatrix(words.words, test_words)
+    # openings are shared by most words, so are only worked out once
+    book = OpeningBook(infilename2, Game(words, strategy, hard=hard),
+        depth).guesses
+    games = test_words    # the answer of each game, or of each of its boards
+    limit = 6    # most attempts a game may take to be solved
+    if boards > 1:
+        # every board is solved with the same guesses, five more than boards
+        games = [tuple(test_words[number:number + boards]) \
+            for number in range(0, len(test_words) - boards + 1, boards)]
+        limit = boards + 5
+    names = [word if boards == 1 else "/".join(word) for word in games]
+    done = {}    # attempts of every game played by an earlier run
+    outfile = None
+    if checkpoint is not None:
+        settings = {"words": os.path.abspath(infilename2),
+            "test_words": os.path.abspath(infilename1), "strategy": strategy,
+            "depth": depth, "hard": hard, "search": budget, "boards": boards,
+            "length": words.length, "games": len(games),
+            "digest": sweep_digest(words, test_words,
+                words.policy_for(strategy, hard))}
+        done = read_checkpoint(checkpoint, settings, names)
+        outfile = open(checkpoint, "a")
+        if not outfile.tell():
+            outfile.write(json.dumps({"checkpoint": CHECKPOINT_VERSION,
+                "settings": settings}) + "\n")
+            outfile.flush()
+            os.fsync(outfile.fileno())
+    # only the games not played by an earlier run are played
+    remaining = [game for number, game in enumerate(games) \
+        if number not in done]
     total = 0    # total number of attempts
+    # attempts weighted by how likely each word is, if the words have a prior
+    weighted = 0.0
+    mass = 0.0
     number = 0    # index of word being tested
     wrong_words = []    # list of all words that could not be solved
     start = time.time()    # for timing each attempt
-    for word in test_words:
+    sweep = {"strategy": strategy, "book": book, "hard": hard,
+        "measure": metrics is not None, "budget": budget}
+    if jobs > 1:
+        # each worker loads the words once, then solves its share of them
+        pool = multiprocessing.Pool(jobs, start_worker,
+            (infilename2, words.length, test_words, sweep))
+        attempts = pool.imap(solve_word, remaining,
+            chunksize=max(1, len(remaining) // (jobs * 16)))
+    else:
+        # this process is the only worker, with the words already loaded
+        start_worker(words, test_words=test_words, settings=sweep)
+        attempts = map(solve_word, remaining)
+    # attempts arrive in the same order as the words whichever way they run
+    for word, name in zip(games, names):
+        if number in done:
+            result = done[number]
+        else:
+            result, timings = next(attempts)
+            for timing in timings or ():
+                timing["word"] = word
+                metrics.write(json.dumps(timing) + "\n")
+            if outfile is not None:
+                outfile.write(json.dumps({"game": number, "word": name,
+                    "attempts": result}) + "\n")
+                # on disk before the next game, so a stopped run loses none
+                outfile.flush()
+                os.fsync(outfile.fileno())
         number += 1
-        print("Algorithm solving instance {} of {}".format(number, len(test_words)))
-        result = wordle_solve(word, infilename2)
-        if result > 6:
-            wrong_words.append(word)
+        print("Algorithm solving instance {} of {}".format(number, len(games)))
+        if result > limit:
+            wrong_words.append(name)
         results[result - 1] += 1
         total += result
+        if words.priors is not None and boards == 1 \
+            and words.index_of(word) is not None:
+            prior = words.priors[words.index_of(word)]
+            weighted += prior * result
+            mass += prior
     end = time.time()    # for timing each attempt
+    if jobs > 1:
+        pool.close()
+        pool.join()
+    if outfile is not None:
+        outfile.close()
     correct = 0
     for number in range(len(results)):
-        if number < 6:
+        if number < limit:
             correct += results[number]
 
     # print information on total results
-    print("SOLVED {:.1f}% OF CASES".format(correct/len(test_words)*100))
-    print("TOOK AN AVERAGE OF {:.1f} ATTEMPTS".format(total/len(test_words)))
-    print("TOOK AN AVERAGE TIME OF {:.2f} SECONDS".format((end-start)/len(test_words)))
+    print("SOLVED {:.1f}% OF CASES".format(correct/len(games)*100))
+    print("TOOK AN AVERAGE OF {:.1f} ATTEMPTS".format(total/len(games)))
+    if mass > 0:
+        print("TOOK A WEIGHTED AVERAGE OF {:.2f} ATTEMPTS".format(
+            weighted/mass))
+    # only games played by this run were timed
+    print("TOOK AN AVERAGE TIME OF {:.2f} SECONDS".format(
+        (end-start)/max(1, len(remaining))))
     print("COULD NOT SOLVE THE FOLLOWING: {}".format(", ".join(wrong_words)))
     print("HISTOGRAM:")
     for index in range(len(results)):
@@ -335,6 +404,62 @@ def test(infilename1, infilename2):
     return
 
 
+def adversarial(infilename1, infilename2, strategy=STRATEGIES[0], depth=2,
+    hard=False, budget=None, length=None):
+    """
+    Plays the solver against an adversary that gives each guess whichever
+    result keeps the game going longest, as Absurdle does, to find the most
+    attempts the solver can ever take against the words to test on.
+
+    Arguments:
+        infilename1: string
+            the name of the file containing all words to test on
+        infilename2: string
+            the name of the file containing all possible words
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        depth: integer
+            the number of opening guesses to look up rather than work out
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+        budget: float
+            the most seconds to search for a guess sure to finish in time on
+            each turn, or None to never search
+        length: integer
+            number of letters in each word, by default the length of most
+            possible words, with test words of other lengths left out
+
+    Returns:
+        None, but prints the worst case of the solver
+    """
+
+    with open(infilename1) as infile:
+        test_words = infile.read().split()
+    words = WordSet(infilename2, length)
+    test_words = [word for word in test_words if len(word) == words.length]
+    book = OpeningBook(infilename2, Game(words, strategy, hard=hard),
+        depth).guesses
+    start = time.time()
+    adversary = Adversary(words, test_words,
+        FeedbackMatrix(words.words, test_words))
+    attempts, count, line = adversary.evaluate(Game(words, strategy, book,
+        hard, search=None if budget is None else Search(words, budget)))
+    end = time.time()
+
+    # print information on the worst case
+    if attempts is None:
+        print("COULD NOT SOLVE {} OF {} WORDS".format(count,
+            len(test_words)))
+    else:
+        print("GUARANTEED TO SOLVE EVERY WORD WITHIN {} ATTEMPTS".format(
+            attempts))
+        print("{} OF {} WORDS TAKE THAT MANY".format(count, len(test_words)))
+    print("WORST CASE: {}".format(" ".join("{}:{}".format(guess, result) \
+        for guess, result in line)))
+    print("TOOK {:.1f} SECONDS".format(end - start))
+    return
+
+
 def main():
     """
     Solves an instance of the Wordle game based on input data.
@@ -347,21 +472,79 @@ def main():
         words to try until the word is found
     """
 
-    # check that files are specified
-    if len(sys.argv) != 3:
-        print("Error: no input file specified.",
-            "Proper Usage: python3 wordle_solver.py <filename> <filename>")
-        return
+    parser = argparse.ArgumentParser(
+        description="Tests the Wordle solver against every word in a file.")
+    parser.add_argument("infilename1", help="file of all words to test on")
+    parser.add_argument("infilename2", help="file of all possible words")
+    parser.add_argument("--jobs", type=int, default=1,
+        help="number of processes to solve words with, 0 for one per core")
+    parser.add_argument("--strategy", choices=STRATEGIES,
+        default=STRATEGIES[0], help="how to choose the next guess")
+    parser.add_argument("--book-depth", metavar="N", type=int,
+        help="number of opening guesses to precompute and store, 0 for none, "
+        "2 by default")
+    parser.add_argument("--hard", action="store_true",
+        help="only make guesses using every hint revealed so far")
+    parser.add_argument("--metrics", metavar="OUTFILENAME",
+        help="write measurements of every turn as lines of JSON")
+    parser.add_argument("--search", metavar="SECONDS", type=float,
+        help="once few words are left, search for guesses sure to solve "
+        "every word within six attempts, for at most this long each turn")
+    parser.add_argument("--boards", metavar="N", type=int, default=1,
+        help="play N boards at once, as in Quordle or Octordle, taking the "
+        "next N words to test on as the answers of each game")
+    parser.add_argument("--length", metavar="N", type=int,
+        help="only use words of N letters, by default the length of most "
+        "possible words")
+    parser.add_argument("--checkpoint", metavar="FILENAME",
+        help="note the result of every word in this file as it is solved, "
+        "and skip the words already noted there by an earlier run")
+    parser.add_argument("--adversarial", action="store_true",
+        help="rather than solving each word, play against an adversary "
+        "giving the result that keeps every game going longest, and report "
+        "the most attempts the solver can ever take")
+    args = parser.parse_args()
 
     # check that the specified file exists
-    infilename1 = sys.argv[1]
-    infilename2 = sys.argv[2]
+    infilename1 = args.infilename1
+    infilename2 = args.infilename2
     if not os.path.exists(infilename1) or not os.path.exists(infilename2):
         print("Error: input file specified does not exist.",
-            "Proper Usage: python3 wordle_solver.py <filename> <filename>")
+            "Proper Usage: python3 wordle_test.py <filename> <filename>",
+            "[--jobs <number>] [--strategy <strategy>] [--book-depth <N>]")
         return
-
-    test(infilename1, infilename2)    # solve all instances of the game
+    jobs = args.jobs or os.cpu_count()
+    if args.boards > 1:
+        # several boards are played without any of these, so none is ignored
+        given = [option for option, value in (("--hard", args.hard),
+            ("--search", args.search is not None),
+            ("--metrics", args.metrics is not None),
+            ("--book-depth", args.book_depth is not None),
+            ("--adversarial", args.adversarial)) if value]
+        if given:
+            print("Error: {} cannot be used with --boards.".format(
+                ", ".join(given)))
+            return
+    depth = 2 if args.book_depth is None else args.book_depth
+
+    try:
+        if args.adversarial:
+            adversarial(infilename1, infilename2, args.strategy,
+                depth, args.hard, args.search, args.length)
+            return
+        # solve all instances of the game
+        if args.metrics:
+            with open(args.metrics, "w") as outfile:
+                test(infilename1, infilename2, jobs, args.strategy,
+                    depth, args.hard, outfile, args.search,
+                    args.boards, args.length, args.checkpoint)
+        else:
+            test(infilename1, infilename2, jobs, args.strategy,
+                depth, args.hard, budget=args.search,
+                boards=args.boards, length=args.length,
+                checkpoint=args.checkpoint)
+    except ValueError as error:
+        print("Error: {}.".format(error))
     return
 
 
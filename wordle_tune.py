@@ -0,0 +1,179 @@
+# Made by Isaac Joffe
+
+import sys    # to write errors to standard error
+import os    # to check that file exists
+import argparse    # for command line arguments
+import multiprocessing    # to try many policies at once
+
+from feedback import FeedbackMatrix    # to give results of guesses
+# to hold the words, loaded once in each process
+from wordle_solver import WordSet, STRATEGIES, start_worker, worker_data
+from wordle_test import wordle_solve    # to play games as tests do
+# to store the best policy
+from policy import ThresholdPolicy, save_policy, policy_filename
+
+
+def evaluate(settings):
+    """
+    Plays every test word with a policy, using the data loaded by
+    start_worker.
+
+    Arguments:
+        settings: tuple of floats
+            the ratio and offset of the policy to try
+
+    Returns:
+        score: tuple
+            the number of words solved within six attempts and the total
+            number of attempts, along with the settings
+    """
+
+    policy = ThresholdPolicy(*settings)
+    solved = 0
+    total = 0
+    for word in worker_data["test_words"]:
+        # a game the solver gives up on takes more than six attempts
+        number = wordle_solve(word, worker_data["words"],
+            worker_data["matrix"], worker_data["strategy"],
+            hard=worker_data["hard"], policy=policy)
+        solved += number <= 6
+        total += number
+    return solved, total, settings
+
+
+def tune(infilename1, infilename2, ratios, offsets, jobs=1,
+    strategy=STRATEGIES[0], hard=False, outfilename=None, length=None):
+    """
+    Tries every combination of settings and stores the policy solving the
+    most words within six attempts, then in the fewest attempts.
+
+    Arguments:
+        infilename1: string
+            the name of the file containing all words to test on
+        infilename2: string
+            the name of the file containing all possible words
+        ratios: list of floats
+            the shares of all words to try probing down to
+        offsets: list of floats
+            the numbers of words to try adding to those shares
+        jobs: integer
+            the number of processes to try policies with at once
+        strategy: string
+            how to choose the next guess, one of STRATEGIES
+        hard: boolean
+            whether every guess must use all the hints revealed so far
+        outfilename: string
+            name of the file to store the best policy in, next to the
+            words and named by strategy and mode if not given, where the
+            solver looks for it
+        length: integer
+            number of letters in each word, by default the length of most
+            possible words, with test words of other lengths left out
+
+    Returns:
+        None, but creates a file containing the best policy
+    """
+
+    if strategy == "entropy":
+        # the entropy strategy never probes, so every policy plays the same
+        raise ValueError("the entropy strategy does not use a policy")
+    with open(infilename1) as infile:
+        test_words = infile.read().split()
+    words = WordSet(infilename2, length)
+    test_words = [word for word in test_words if len(word) == words.length]
+    # built once here so workers only have to map it
+    FeedbackMatrix(words.words, test_words)
+    grid = [(ratio, offset) for ratio in ratios for offset in offsets]
+    mode = {"strategy": strategy, "hard": hard}
+    if jobs > 1:
+        pool = multiprocessing.Pool(jobs, start_worker,
+            (infilename2, words.length, test_words, mode))
+        scores = pool.imap_unordered(evaluate, grid)
+    else:
+        start_worker(words, test_words=test_words, settings=mode)
+        scores = map(evaluate, grid)
+
+    best = None
+    for number, (solved, total, settings) in enumerate(scores):
+        print("Policy {} of {}: ratio {}, offset {} solved {:.1f}% of cases "
+            "in an average of {:.3f} attempts".format(number + 1, len(grid),
+            settings[0], settings[1], solved / len(test_words) * 100,
+            total / len(test_words)))
+        # ties go to the earliest settings tried, whatever order they finish
+        score = (-solved, total, grid.index(settings))
+        if best is None or score < best[0]:
+            best = (score, settings)
+    if jobs > 1:
+        pool.close()
+        pool.join()
+
+    policy = ThresholdPolicy(*best[1])
+    outfilename = outfilename or policy_filename(infilename2, words.length,
+        strategy, hard)
+    save_policy(policy, outfilename)
+    print("Wrote policy with ratio {} and offset {} to {}".format(
+        policy.ratio, policy.offset, outfilename))
+    return
+
+
+def main():
+    """
+    Tunes when the solver stops probing based on input data.
+
+    Arguments:
+        None, but reads the data of valid and test words from specified files
+
+    Returns:
+        None, but writes the best policy found
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Tries many settings for when the solver stops probing "
+        "with the most valuable word, against every word in a file, and "
+        "stores the best next to the possible words for the solver to use.")
+    parser.add_argument("infilename1", help="file of all words to test on")
+    parser.add_argument("infilename2", help="file of all possible words")
+    parser.add_argument("--ratios", default="0,0.0005,0.001,0.002,0.004,0.008",
+        help="comma separated shares of all words to try probing down to")
+    parser.add_argument("--offsets", default="0,1,2,4,8",
+        help="comma separated numbers of words to add to those shares")
+    parser.add_argument("--jobs", type=int, default=0,
+        help="number of processes to try policies with, 0 for one per core")
+    parser.add_argument("--strategy", choices=STRATEGIES,
+        default=STRATEGIES[0], help="how to choose the next guess")
+    parser.add_argument("--hard", action="store_true",
+        help="only make guesses using every hint revealed so far")
+    parser.add_argument("--length", metavar="N", type=int,
+        help="only use words of N letters, by default the length of most "
+        "possible words")
+    parser.add_argument("--output", metavar="OUTFILENAME",
+        help="file to store the best policy in, by default next to the "
+        "possible words, named by strategy and mode, where the solver looks "
+        "for it")
+    args = parser.parse_args()
+
+    # check that the specified files exist
+    if not os.path.exists(args.infilename1) \
+        or not os.path.exists(args.infilename2):
+        print("Error: input file specified does not exist.",
+            "Proper Usage: python3 wordle_tune.py <filename> <filename>",
+            file=sys.stderr)
+        return
+    try:
+        ratios = [float(ratio) for ratio in args.ratios.split(",")]
+        offsets = [float(offset) for offset in args.offsets.split(",")]
+    except ValueError:
+        print("Error: ratios and offsets must be numbers.", file=sys.stderr)
+        return
+    jobs = args.jobs or os.cpu_count()
+
+    try:
+        tune(args.infilename1, args.infilename2, ratios, offsets, jobs,
+            args.strategy, args.hard, args.output, args.length)
+    except ValueError as error:
+        print("Error: {}.".format(error))
+    return
+
+
+if __name__ == "__main__":
+    main()